@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""Latency and memory benchmark for the Stop, PreCompact and SessionStart hooks.
+
+Generates synthetic .cc-claude-codex/status.md files from
+references/status-template.md (1 KB up to 10 MB, thousands of subtasks), runs
+each hook script with realistic hook stdin JSON, and reports wall time, peak
+RSS and output size as percentiles. Each hook is measured "cold" (no status
+index sidecar or snapshots on disk) and "warm" (state left by a previous run).
+
+Usage:
+  python benchmarks/hook_bench.py [--sizes 1K,10K,100K,1M,10M] [--runs 10]
+                                  [--output results.json] [--compare baseline.json]
+                                  [--hooks-dir ~/.claude/skills/cc-claude-codex/scripts]
+
+With --compare, exits 1 if any hook/size/mode p50 wall time or peak RSS
+regressed by more than --threshold (default 0.2 = 20%) against the baseline.
+
+When session_inject is benchmarked, its condensed view is also checked against
+the default budget at each size, on a file whose open subtasks fit the budget
+(only the current batch and open checkbox lines may exceed it); exits 1 if
+any view is over budget.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATE = REPO_ROOT / "references" / "status-template.md"
+
+HOOKS = {
+    "stop_check": ("stop_check.py", "Stop", []),
+    "session_inject": ("session_inject.py", "SessionStart", []),
+    "pre_compact": ("pre_compact.py", "PreCompact", []),
+}
+MODES = ("cold", "warm")
+SUBTASKS_PER_BATCH = 5
+DONE_RATIO = 0.8
+PERCENTILES = (50, 90, 99)
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    units = {"K": 1024, "M": 1024 * 1024}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def split_template(template: str) -> tuple:
+    """Split the template into (preamble, {section heading: body})."""
+    preamble, sections, current = [], {}, None
+    for line in template.splitlines():
+        if line.startswith("## "):
+            current = line
+            sections[current] = []
+        elif current is None:
+            preamble.append(line)
+        else:
+            sections[current].append(line)
+    return preamble, sections
+
+
+def generate_status(template: str, target_bytes: int, open_subtasks: int = None) -> tuple:
+    """Build a status.md of roughly *target_bytes*; returns (text, subtask count).
+
+    By default DONE_RATIO of the subtasks are checked; with *open_subtasks*,
+    all but the last *open_subtasks* are.
+    """
+    preamble, sections = split_template(template)
+
+    def keep_comments(body: list) -> list:
+        # Real files still carry the template's guidance comments
+        kept, in_comment = [], False
+        for line in body:
+            if line.startswith("<!--") or in_comment:
+                kept.append(line)
+                in_comment = "-->" not in line
+        return kept
+
+    def unit(i: int, total: int) -> dict:
+        batch = i // SUBTASKS_PER_BATCH + 1
+        done = i < (total * DONE_RATIO if open_subtasks is None else total - open_subtasks)
+        return {
+            "requirement": [
+                f"### Requirement: Capability {i}",
+                "",
+                f"The system MUST handle capability {i} for every supported input and report failures clearly.",
+                "",
+                f"#### Scenario: Capability {i} happy path",
+                f"- **WHEN** the user triggers capability {i} with valid input",
+                f"- **THEN** the system completes it and shows the result",
+                "",
+            ],
+            "subtask": ([f"### Batch {batch}: Theme {batch}"] if i % SUBTASKS_PER_BATCH == 0 else []) + [
+                f"- [{'x' if done else ' '}] Implement capability {i}",
+                f"  - **Covers:** Requirement: Capability {i} > Scenario: Capability {i} happy path",
+                f"  - **Acceptance:** capability {i} returns the documented result and errors are surfaced",
+                f"  - **Scope:** `src/feature_{i % 97}.py`, `tests/test_feature_{i % 97}.py`",
+            ],
+            "verification": [f"| Subtask {i} | Capability {i} happy path | "
+                             f"{'✅ PASS' if done else '⏳ Pending'} | pytest | run {i} |"],
+            "log": [f"| 2026-01-01 10:{i % 60:02d} | Batch {batch} | completed | subtask {i} |"]
+                   if i % SUBTASKS_PER_BATCH == 0 else [],
+        }
+
+    def render(count: int) -> str:
+        units = [unit(i, count) for i in range(count)]
+        lines = list(preamble)
+        for heading, body in sections.items():
+            lines.append(heading)
+            name = heading[3:].strip()
+            if name == "Requirements":
+                lines += keep_comments(body) + [""]
+                lines += [line for u in units for line in u["requirement"]]
+            elif name == "Subtasks":
+                lines += keep_comments(body) + [""]
+                lines += [line for u in units for line in u["subtask"]]
+                lines.append("")
+            elif name in ("Verification Results", "Codex Execution Log"):
+                table = [line for line in body if line.startswith("|")]
+                rest = [line for line in body if not line.startswith("|")]
+                key = "verification" if name == "Verification Results" else "log"
+                lines += keep_comments(rest) + table + [line for u in units for line in u[key]]
+                lines += [line for line in rest if line.strip() and not line.startswith("<!--")]
+                lines.append("")
+            else:
+                lines += body
+        return "\n".join(lines) + "\n"
+
+    base = len(render(0).encode("utf-8"))
+    per_unit = max(1, len(render(SUBTASKS_PER_BATCH).encode("utf-8")) - base) / SUBTASKS_PER_BATCH
+    count = max(1, int((target_bytes - base) / per_unit))
+    return render(count), count
+
+
+def run_hook(script: Path, event: str, cwd: Path, args: list) -> dict:
+    """Run one hook process; returns wall time, peak RSS and output size."""
+    hook_input = {
+        "session_id": "bench-session",
+        "transcript_path": str(cwd / "transcript.jsonl"),
+        "cwd": str(cwd),
+        "hook_event_name": event,
+    }
+    if event == "SessionStart":
+        hook_input["source"] = "compact"
+    elif event == "PreCompact":
+        hook_input.update(trigger="auto", custom_instructions="")
+    elif event == "Stop":
+        hook_input["stop_hook_active"] = False
+
+    with tempfile.TemporaryFile() as stdin, tempfile.TemporaryFile() as out:
+        stdin.write(json.dumps(hook_input).encode("utf-8"))
+        stdin.seek(0)
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, str(script)] + args,
+                                stdin=stdin, stdout=out, stderr=out, cwd=cwd)
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(proc.pid, 0)
+            wall = time.perf_counter() - start
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is KiB on Linux and bytes on macOS
+            rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+        else:
+            proc.wait()
+            wall = time.perf_counter() - start
+            rss = None
+        output_bytes = out.tell()
+    return {"wall_ms": wall * 1000, "peak_rss_bytes": rss, "output_bytes": output_bytes,
+            "exit_code": proc.returncode}
+
+
+def reset_state(state_dir: Path):
+    """Remove everything the hooks cache or write, leaving status.md."""
+    for path in state_dir.iterdir():
+        if path.name == "status.md":
+            continue
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+
+
+def percentiles(values: list) -> dict:
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return {}
+    stats = {"min": values[0], "max": values[-1], "mean": sum(values) / len(values)}
+    for p in PERCENTILES:
+        # Nearest-rank percentile
+        rank = max(1, -(-p * len(values) // 100))
+        stats[f"p{p}"] = values[rank - 1]
+    return stats
+
+
+def benchmark(hooks_dir: Path, sizes: list, runs: int, hooks: list) -> list:
+    template = TEMPLATE.read_text(encoding="utf-8-sig")
+    results = []
+    for target in sizes:
+        content, subtasks = generate_status(template, target)
+        size_bytes = len(content.encode("utf-8"))
+        with tempfile.TemporaryDirectory(prefix="hook-bench-") as tmp:
+            project = Path(tmp)
+            state_dir = project / ".cc-claude-codex"
+            state_dir.mkdir()
+            (state_dir / "status.md").write_text(content, encoding="utf-8")
+            for name in hooks:
+                script_name, event, args = HOOKS[name]
+                for mode in MODES:
+                    samples = []
+                    reset_state(state_dir)
+                    if mode == "warm":
+                        run_hook(hooks_dir / script_name, event, project, args)
+                    for _ in range(runs):
+                        if mode == "cold":
+                            reset_state(state_dir)
+                        samples.append(run_hook(hooks_dir / script_name, event, project, args))
+                    results.append({
+                        "hook": name,
+                        "mode": mode,
+                        "target_bytes": target,
+                        "size_bytes": size_bytes,
+                        "subtasks": subtasks,
+                        "runs": runs,
+                        "exit_codes": sorted({s["exit_code"] for s in samples}),
+                        "wall_ms": percentiles([s["wall_ms"] for s in samples]),
+                        "peak_rss_bytes": percentiles([s["peak_rss_bytes"] for s in samples]),
+                        "output_bytes": percentiles([s["output_bytes"] for s in samples]),
+                    })
+                    r = results[-1]
+                    rss = r["peak_rss_bytes"].get("p50")
+                    print(f"{name:<15} {mode:<5} {size_bytes:>10} B {subtasks:>6} subtasks  "
+                          f"wall p50 {r['wall_ms']['p50']:8.1f} ms  p99 {r['wall_ms']['p99']:8.1f} ms  "
+                          f"rss p50 {rss / 1048576 if rss else 0:6.1f} MiB  "
+                          f"out p50 {r['output_bytes']['p50']:>8} B", file=sys.stderr)
+    return results
+
+
+def check_budget(hooks_dir: Path, sizes: list) -> list:
+    """Return session_inject views that exceed the default budget although their open subtasks fit it."""
+    sys.path.insert(0, str(hooks_dir))
+    import session_inject
+
+    template = TEMPLATE.read_text(encoding="utf-8-sig")
+    budget = session_inject.DEFAULT_BUDGET
+    violations = []
+    for target in sizes:
+        content, _ = generate_status(template, target, open_subtasks=SUBTASKS_PER_BATCH)
+        view, _ = session_inject.condense(content, budget)
+        view_bytes = len(view.encode("utf-8"))
+        print(f"budget          {len(content.encode('utf-8')):>10} B -> {view_bytes:>8} B "
+              f"(budget {budget} B)", file=sys.stderr)
+        if view_bytes > budget:
+            violations.append(f"{target} B status.md condensed to {view_bytes} B, over the {budget} B budget")
+    return violations
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Return human-readable regressions against a baseline results file."""
+    def key(r):
+        return (r["hook"], r["mode"], r["target_bytes"])
+
+    previous = {key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = previous.get(key(r))
+        if old is None:
+            continue
+        for metric in ("wall_ms", "peak_rss_bytes"):
+            new_p50, old_p50 = r[metric].get("p50"), old[metric].get("p50")
+            if new_p50 and old_p50 and new_p50 > old_p50 * (1 + threshold):
+                regressions.append(f"{r['hook']} {r['mode']} {r['size_bytes']} B: {metric} p50 "
+                                   f"{old_p50:.1f} -> {new_p50:.1f} (+{(new_p50 / old_p50 - 1) * 100:.0f}%)")
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hook latency and memory")
+    parser.add_argument("--sizes", default="1K,10K,100K,1M,10M",
+                        help="Comma-separated status.md sizes (default: 1K,10K,100K,1M,10M)")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per hook, size and mode (default: 10)")
+    parser.add_argument("--hooks", default=",".join(HOOKS), help=f"Hooks to run (default: {','.join(HOOKS)})")
+    parser.add_argument("--hooks-dir", default=str(REPO_ROOT / "scripts"),
+                        help="Directory holding the hook scripts (default: this checkout)")
+    parser.add_argument("--output", help="Write results JSON to this file (default: stdout)")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed p50 slowdown/growth against the baseline (default: 0.2)")
+    args = parser.parse_args()
+
+    hooks = [h.strip() for h in args.hooks.split(",") if h.strip()]
+    unknown = [h for h in hooks if h not in HOOKS]
+    if unknown:
+        print(f"Error: unknown hooks: {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    hooks_dir = Path(args.hooks_dir).expanduser()
+
+    results = benchmark(hooks_dir, sizes, max(1, args.runs), hooks)
+    violations = check_budget(hooks_dir, sizes) if "session_inject" in hooks else []
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "hooks_dir": str(hooks_dir),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    for line in violations:
+        print(f"OVER BUDGET: {line}", file=sys.stderr)
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.", file=sys.stderr)
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Offline load test for multi_agent_verify.run_agents and cc-claude-codex.py.
+
+Puts `codex`, `opencode` and `mock-agent` shims for benchmarks/mock_agent.py on
+PATH, so no real agent binaries or network access are needed, then:
+
+  verify  Runs multi_agent_verify.run_agents against a scratch git repo with
+          2..50 simulated agents per round. A mix of well-behaved, committing,
+          failing, hanging (timeout) and child-spawning agents measures
+          scheduler overhead, timeout accuracy, log completeness (pipe
+          handling) and orchestrator memory.
+  codex   Runs cc-claude-codex.py in a scratch workspace for normal exit,
+          error exit, stale timeout, hard timeout and a lingering child,
+          measuring exit-detection latency and exit-code correctness.
+
+Usage:
+  python benchmarks/load_test.py [--agents 2,10,25,50] [--duration 2] [--timeout 4]
+                                 [--scenario verify|codex|all] [--output results.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS = REPO_ROOT / "scripts"
+MOCK_AGENT = Path(__file__).resolve().parent / "mock_agent.py"
+
+LINE_RE = re.compile(rb"^mock-agent line (\d+) ", re.MULTILINE)
+DONE_RE = re.compile(rb"^mock-agent done lines=(\d+)$", re.MULTILINE)
+
+
+def install_shims(bin_dir: Path):
+    """Create codex/opencode/mock-agent executables that run mock_agent.py."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for name in ("codex", "opencode", "mock-agent"):
+        if os.name == "nt":
+            (bin_dir / f"{name}.cmd").write_text(f'@"{sys.executable}" "{MOCK_AGENT}" %*\r\n', encoding="utf-8")
+        else:
+            shim = bin_dir / name
+            shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{MOCK_AGENT}" "$@"\n', encoding="utf-8")
+            shim.chmod(0o755)
+    os.environ["PATH"] = str(bin_dir) + os.pathsep + os.environ.get("PATH", "")
+
+
+def make_repo(path: Path):
+    path.mkdir(parents=True)
+    for i in range(20):
+        (path / "src").mkdir(exist_ok=True)
+        (path / "src" / f"module_{i}.py").write_text(f"VALUE = {i}\n", encoding="utf-8")
+    git = ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.invalid"]
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=path, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "initial"], cwd=path, check=True)
+
+
+def peak_rss_self():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def agent_plan(count: int, duration: float, timeout: int) -> list:
+    """Behaviour mix for *count* agents: (name, mock args, expected status, agent timeout)."""
+    kinds = ["plain", "commit", "plain", "spawn", "fail", "plain", "hang", "modify"]
+    plan = []
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        args = ["--duration", str(duration), "--rate", "50"]
+        expected = "completed"
+        if kind == "commit":
+            args += ["--modify", "2", "--commit"]
+        elif kind == "modify":
+            args += ["--modify", "3"]
+        elif kind == "spawn":
+            # Children outlive the agent while holding its stdout
+            args += ["--spawn", "2", "--child-duration", str(timeout + 5)]
+        elif kind == "fail":
+            args += ["--exit-code", "3"]
+            expected = "failed"
+        elif kind == "hang":
+            args += ["--hang"]
+            expected = "timeout"
+        plan.append((f"mock-{i:02d}-{kind}", args, expected, kind))
+    return plan
+
+
+def check_log(log_file: str) -> dict:
+    """Verify a mock agent's log has every numbered line and the done marker."""
+    try:
+        data = Path(log_file).read_bytes()
+    except (OSError, TypeError):
+        return {"log_ok": False, "log_bytes": 0}
+    numbers = [int(n) for n in LINE_RE.findall(data)]
+    done = DONE_RE.search(data)
+    expected = int(done.group(1)) if done else None
+    complete = expected is not None and numbers == list(range(1, expected + 1))
+    return {"log_ok": complete, "log_bytes": len(data), "lines": len(numbers)}
+
+
+def run_verify_round(mav, repo: Path, count: int, duration: float, timeout: int, pool_size: int) -> dict:
+    plan = agent_plan(count, duration, timeout)
+    agents = [mav.AgentConfig(name=name, cli_cmd=["mock-agent"] + args,
+                              timeout=timeout if kind == "hang" else timeout * 4)
+              for name, args, _, kind in plan]
+    ts = datetime.now().strftime("%Y%m%d-%H%M%S") + f"-n{count}"
+    captured = io.StringIO()
+    start = time.monotonic()
+    with contextlib.redirect_stdout(captured):
+        report = mav.run_agents(str(repo), ts, "load test prompt", timeout=timeout,
+                                pool_size=pool_size, agents=agents, max_parallel=count)
+    wall = time.monotonic() - start
+
+    agents_out = report.get("agents", {})
+    mismatches, log_failures, overheads, timeout_errors = [], [], [], []
+    for name, _, expected, kind in plan:
+        result = agents_out.get(name, {})
+        if result.get("status") != expected:
+            mismatches.append(f"{name}: expected {expected}, got {result.get('status')}")
+        if kind == "hang":
+            timeout_errors.append(result.get("duration_seconds", 0) - timeout)
+        else:
+            overheads.append(result.get("duration_seconds", 0) - duration)
+            log = check_log(result.get("log_file"))
+            if not log["log_ok"]:
+                log_failures.append(f"{name}: {log}")
+        if kind == "commit" and not result.get("committed"):
+            mismatches.append(f"{name}: expected a commit")
+
+    # Everything runs in parallel, so the ideal wall time is the slowest agent
+    ideal = timeout if any(kind == "hang" for *_, kind in plan) else duration
+    for path in report.get("worktree_paths", []):
+        if not os.path.basename(path).startswith("verify-pool-"):
+            mav.remove_worktree(str(repo), path)
+    if pool_size > 0:
+        mav.WorktreePool(str(repo), pool_size).release_leases(ts)
+    return {
+        "agents": count,
+        "wall_seconds": round(wall, 2),
+        "ideal_seconds": ideal,
+        "scheduler_overhead_seconds": round(wall - ideal, 2),
+        "per_agent_overhead_seconds": summarize(overheads),
+        "timeout_overshoot_seconds": summarize(timeout_errors),
+        "status_mismatches": mismatches,
+        "log_failures": log_failures,
+        "completed": report.get("completed_count"),
+        # Spawning agents leave 2 children each; all of them should be stopped
+        "reaped_processes": sum(r.get("reaped_processes", 0) for r in agents_out.values()),
+        "orchestrator_peak_rss_bytes": peak_rss_self(),
+        "children_rusage": report.get("children_rusage"),
+    }
+
+
+def summarize(values: list) -> dict:
+    if not values:
+        return {}
+    values = sorted(values)
+    return {"min": round(values[0], 2), "p50": round(values[len(values) // 2], 2),
+            "max": round(values[-1], 2), "mean": round(sum(values) / len(values), 2)}
+
+
+def scenario_verify(work: Path, counts: list, duration: float, timeout: int, pool_size: int) -> list:
+    sys.path.insert(0, str(SCRIPTS))
+    import multi_agent_verify as mav
+
+    repo = work / "repo"
+    make_repo(repo)
+    rounds = []
+    for count in counts:
+        result = run_verify_round(mav, repo, count, duration, timeout, pool_size)
+        rounds.append(result)
+        print(f"verify  {count:>3} agents  wall {result['wall_seconds']:6.2f}s  "
+              f"overhead {result['scheduler_overhead_seconds']:5.2f}s  "
+              f"timeout overshoot {result['timeout_overshoot_seconds'].get('max', 0):5.2f}s  "
+              f"mismatches {len(result['status_mismatches'])}  log failures {len(result['log_failures'])}  "
+              f"reaped {result['reaped_processes']}",
+              file=sys.stderr)
+    return rounds
+
+
+CODEX_CASES = [
+    # name, mock args, cc-claude-codex args, expected exit code, expected seconds to exit
+    ("done", "--duration 1 --tick-progress", [], 0, 1),
+    ("error", "--duration 1 --exit-code 2", [], 1, 1),
+    ("stale", "--duration 1 --hang", ["--stale-timeout", "2"], 124, 3),
+    ("hard-timeout", "--duration 30 --rate 5", ["--max-timeout", "2"], 124, 2),
+    ("lingering-child", "--duration 1 --spawn 1 --child-duration 20", [], 0, 1),
+]
+
+
+def scenario_codex(work: Path) -> list:
+    results = []
+    for name, mock_args, extra, expected_code, expected_seconds in CODEX_CASES:
+        workspace = work / f"codex-{name}"
+        state = workspace / ".cc-claude-codex"
+        state.mkdir(parents=True)
+        (state / "codex-progress.md").write_text(
+            "# Codex Progress\n\n**Status:** in_progress\n\n## Steps\n- [ ] Step 1\n- [ ] Step 2\n- [ ] Step 3\n",
+            encoding="utf-8")
+        env = dict(os.environ, MOCK_AGENT_ARGS=mock_args)
+        start = time.monotonic()
+        proc = subprocess.run([sys.executable, str(SCRIPTS / "cc-claude-codex.py")] + extra,
+                              cwd=workspace, env=env, capture_output=True, timeout=120)
+        wall = time.monotonic() - start
+        logs = sorted((state / "logs").glob("codex-*.log"))
+        log = check_log(str(logs[-1])) if logs else {"log_ok": False}
+        runs = [json.loads(line) for line in (state / "logs" / "index.jsonl").read_text(encoding="utf-8").splitlines()]
+        result = {
+            "case": name,
+            "exit_code": proc.returncode,
+            "expected_exit_code": expected_code,
+            "wall_seconds": round(wall, 2),
+            "detection_latency_seconds": round(wall - expected_seconds, 2),
+            "log_ok": log["log_ok"] or expected_code == 124,
+            "reaped_processes": runs[-1].get("reaped_processes") if runs else None,
+        }
+        results.append(result)
+        ok = result["exit_code"] == expected_code
+        print(f"codex   {name:<16} exit {proc.returncode:>3} ({'ok' if ok else 'UNEXPECTED'})  "
+              f"wall {wall:6.2f}s  latency {result['detection_latency_seconds']:5.2f}s  "
+              f"reaped {result['reaped_processes']}", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline orchestrator load test with mock agents")
+    parser.add_argument("--scenario", choices=("verify", "codex", "all"), default="all")
+    parser.add_argument("--agents", default="2,10,25,50", help="Agent counts per verify round (default: 2,10,25,50)")
+    parser.add_argument("--duration", type=float, default=2.0, help="Simulated work per agent in seconds (default: 2)")
+    parser.add_argument("--timeout", type=int, default=4, help="Timeout for hanging agents in seconds (default: 4)")
+    parser.add_argument("--pool-size", type=int, default=0,
+                        help="Worktree pool size passed to run_agents (default: 0 = fresh worktrees)")
+    parser.add_argument("--output", help="Write results JSON to this file (default: stdout)")
+    args = parser.parse_args()
+
+    if shutil.which("git") is None:
+        print("Error: git is required.", file=sys.stderr)
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory(prefix="load-test-") as tmp:
+        work = Path(tmp)
+        install_shims(work / "bin")
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "duration": args.duration,
+                "timeout": args.timeout,
+            },
+        }
+        if args.scenario in ("verify", "all"):
+            counts = [int(n) for n in args.agents.split(",") if n.strip()]
+            report["verify"] = scenario_verify(work, counts, args.duration, args.timeout, args.pool_size)
+        if args.scenario in ("codex", "all"):
+            report["codex"] = scenario_codex(work)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    failed = any(r["status_mismatches"] or r["log_failures"] for r in report.get("verify", []))
+    failed = failed or any(r["exit_code"] != r["expected_exit_code"] for r in report.get("codex", []))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Offline stand-in for the `codex` and `opencode` CLIs.
+
+Accepts the arguments the orchestrators pass (e.g. `exec --sandbox X -o FILE
+PROMPT` or `run PROMPT`) and ignores the ones it does not model. Behaviour is
+controlled by its own options, which may also come from the MOCK_AGENT_ARGS
+environment variable so a PATH shim named `codex` can be configured without
+changing the orchestrator's command line:
+
+  --duration S        seconds of simulated work (default: 1)
+  --rate N            output lines per second while working (default: 20)
+  --line-bytes N      bytes per output line (default: 80)
+  --exit-code N       exit status once done (default: 0)
+  --modify N          files to create/modify in the working directory
+  --commit            git-commit the modified files
+  --hang              after the work, stop writing output and never exit
+  --spawn N           start N child processes that share stdout and outlive the agent
+  --child-duration S  how long each spawned child sleeps (default: 30)
+  --memory-mb N       allocate and hold N MiB while working
+  --tick-progress     check off codex-progress.md steps as the work advances
+
+Lines are numbered ("mock-agent line 17 ...") so a harness can check that no
+output was lost between the agent and its log.
+"""
+
+import argparse
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROGRESS_FILE = Path(".cc-claude-codex") / "codex-progress.md"
+UNCHECKED_RE = re.compile(r"^- \[ \] ", re.MULTILINE)
+
+
+def parse_args(argv: list) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mock agent CLI", add_help=True)
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--rate", type=float, default=20.0)
+    parser.add_argument("--line-bytes", type=int, default=80)
+    parser.add_argument("--exit-code", type=int, default=0)
+    parser.add_argument("--modify", type=int, default=0)
+    parser.add_argument("--commit", action="store_true")
+    parser.add_argument("--hang", action="store_true")
+    parser.add_argument("--spawn", type=int, default=0)
+    parser.add_argument("--child-duration", type=float, default=30.0)
+    parser.add_argument("--memory-mb", type=int, default=0)
+    parser.add_argument("--tick-progress", action="store_true")
+    # codex exec writes its final message here
+    parser.add_argument("-o", "--output-last-message", default=None)
+    args, _ = parser.parse_known_args(shlex.split(os.environ.get("MOCK_AGENT_ARGS", "")) + argv)
+    return args
+
+
+def spawn_children(count: int, duration: float):
+    for _ in range(count):
+        subprocess.Popen([sys.executable, "-c", f"import time; time.sleep({duration})"])
+
+
+def tick_progress(fraction: float):
+    """Check off the share of codex-progress.md steps matching *fraction* of the work done."""
+    try:
+        text = PROGRESS_FILE.read_text(encoding="utf-8")
+    except OSError:
+        return
+    total = len(re.findall(r"^- \[[ xX]\] ", text, re.MULTILINE))
+    done = total - len(UNCHECKED_RE.findall(text))
+    target = int(total * fraction)
+    if target > done:
+        text = UNCHECKED_RE.sub("- [x] ", text, count=target - done)
+        PROGRESS_FILE.write_text(text, encoding="utf-8")
+
+
+def modify_files(count: int, commit: bool):
+    for i in range(count):
+        path = Path(f"mock_agent_{i}.txt")
+        path.write_text(f"written by mock agent pid {os.getpid()}\n", encoding="utf-8")
+    if commit and count:
+        subprocess.run(["git", "add", "-A"], capture_output=True)
+        subprocess.run(["git", "-c", "user.name=mock", "-c", "user.email=mock@example.invalid",
+                        "commit", "-q", "-m", "mock agent changes"], capture_output=True)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    ballast = bytearray(args.memory_mb * 1024 * 1024)
+    for i in range(0, len(ballast), 4096):
+        ballast[i] = 1  # Touch every page so it counts towards RSS
+
+    if args.spawn:
+        spawn_children(args.spawn, args.child_duration)
+
+    out = sys.stdout.buffer
+    start = time.monotonic()
+    interval = 1.0 / args.rate if args.rate > 0 else None
+    line_no = 0
+    while True:
+        elapsed = time.monotonic() - start
+        if elapsed >= args.duration:
+            break
+        if args.tick_progress:
+            tick_progress(elapsed / args.duration)
+        if interval is None:
+            time.sleep(min(0.1, args.duration - elapsed))
+            continue
+        # Emit every line due by now, so the rate holds even when sleeps overshoot
+        due = int(elapsed / interval) + 1
+        while line_no < due:
+            line_no += 1
+            prefix = f"mock-agent line {line_no} "
+            out.write((prefix + "." * max(0, args.line_bytes - len(prefix) - 1) + "\n").encode("ascii"))
+        out.flush()
+        time.sleep(min(interval, max(0.0, args.duration - (time.monotonic() - start))))
+
+    if args.tick_progress:
+        tick_progress(1.0)
+    modify_files(args.modify, args.commit)
+    if args.output_last_message:
+        Path(args.output_last_message).write_text(f"mock agent finished after {line_no} lines\n",
+                                                  encoding="utf-8")
+    out.write(f"mock-agent done lines={line_no}\n".encode("ascii"))
+    out.flush()
+
+    while args.hang:
+        time.sleep(3600)
+    del ballast
+    sys.exit(args.exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,71 @@ then this script tells Codex to read that file and work from it.
 Codex updates the same file as it progresses.
 
 Usage:
-    python cc-claude-codex.py [--readonly] [--max-timeout N] [--stale-timeout N] [--sandbox MODE]
+    python cc-claude-codex.py [--readonly] [--max-timeout N] [--stale-timeout N] [--sandbox MODE] [--events] [--full]
+                              [--retries N] [--backoff SECONDS] [--no-telemetry]
+                              [--log-max-bytes N] [--log-keep-runs N] [--log-keep-days N]
+    python cc-claude-codex.py stats [--since 7d] [--json]    # phase timing percentiles
 """
 
 import argparse
+import difflib
+import gzip
+import hashlib
+import json
+import os
 import platform
+import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
 
+from process_group import popen_kwargs, session_cpu, stop_group
+from telemetry import CODEX_TELEMETRY_FILE, Recorder, stats_main
+
 IS_WINDOWS = platform.system() == "Windows"
 
+# Max bytes per stdout read; every chunk Codex writes counts as activity.
+READ_CHUNK = 64 * 1024
+# How long to keep draining stdout after Codex exits (grandchildren may hold the pipe).
+DRAIN_GRACE = 2.0
+# How often --events mode checks codex-progress.md for changes (mtime/size).
+EVENTS_POLL_INTERVAL = 0.5
+
+# Hashes of what the last result reported, so the next one can print only changes.
+REPORT_STATE_FILE = "report-state.json"
+
+# Log management under .cc-claude-codex/logs/: per-run size cap (head + tail kept),
+# gzip for runs before the latest, retention by count and age, and an index of runs.
+LOG_MAX_BYTES = 16 * 1024 * 1024
+LOG_KEEP_RUNS = 20
+LOG_KEEP_DAYS = 14
+LOG_INDEX_FILE = "index.jsonl"
+LOG_NAME_RE = re.compile(r"^codex-(\d{8}-\d{6})(?:-attempt\d+)?(?:\.log|-output\.md)(?:\.gz)?$")
+# Unindexed logs touched this recently may belong to a run still in progress.
+LOG_ACTIVE_GRACE = 3600
+
+# Liveness signals behind --stale-timeout: new output lines, codex-progress.md
+# edits, CPU time of Codex's session, and file writes in the workspace.
+LIVENESS_INTERVAL = 5.0
+# Share of one CPU the session must use between samples to count as busy.
+CPU_ACTIVE_SHARE = 0.05
+# The workspace scan is the costly signal: run it at most this often, over this many files.
+WORKSPACE_SCAN_INTERVAL = 30.0
+WORKSPACE_SCAN_LIMIT = 50000
+WORKSPACE_SKIP_DIRS = {".git", ".cc-claude-codex", "node_modules", "__pycache__"}
+# Recently seen (normalized) output lines; a repeat is not new activity.
+SEEN_LINES = 512
+MAX_DECISIONS = 50
+ANSI_RE = re.compile(rb"\x1b\[[0-9;?]*[ -/]*[@-~]")
+
+STEP_RE = re.compile(r"^- \[([ xX])\] (.+)$", re.MULTILINE)
+STATUS_RE = re.compile(r"^>\s*Status:\s*(.+?)\s*$", re.MULTILINE)
+BLOCKERS_RE = re.compile(r"^## Blockers[ \t]*$(.*?)(?=^## |\Z)", re.MULTILINE | re.DOTALL)
+
 CODEX_PROMPT = """Read .cc-claude-codex/codex-progress.md now. This is your task file — it contains the goal, project conventions, and step-by-step instructions.
 
 Working rules:
@@ -34,6 +85,11 @@ Working rules:
 
 Begin now — read the file and start working."""
 
+# Appended to CODEX_PROMPT when --retries relaunches Codex after an abnormal exit.
+RESUME_PROMPT = """
+
+This is attempt {attempt}: the previous Codex run ended with "{reason}" before all steps were done. Steps already marked [x] are finished — do not redo them. Resume at step {index}: {step}"""
+
 
 def configure_stdio():
     """Avoid UnicodeEncodeError on non-UTF-8 consoles (e.g., Windows GBK)."""
@@ -46,14 +102,616 @@ def configure_stdio():
                 pass
 
 
+def parse_progress(text: str) -> dict:
+    """Parse codex-progress.md into status, top-level steps and blockers.
+
+    HTML comments (template guidance and examples) are ignored.
+    """
+    text = re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL)
+    status = STATUS_RE.search(text)
+    steps = [(title.replace("**", "").strip(), mark != " ") for mark, title in STEP_RE.findall(text)]
+    blockers = []
+    section = BLOCKERS_RE.search(text)
+    if section:
+        for line in section.group(1).splitlines():
+            line = line.strip().lstrip("-*").strip()
+            if line and line.lower() not in ("(none)", "none"):
+                blockers.append(line)
+    return {"status": status.group(1) if status else "", "steps": steps, "blockers": blockers}
+
+
+def diff_progress(old: dict, new: dict) -> list:
+    """Return events describing what changed between two parse_progress() results."""
+    events = []
+    if old["status"] != new["status"]:
+        events.append({"event": "status_changed", "from": old["status"], "to": new["status"]})
+
+    done = sum(1 for _, checked in new["steps"] if checked)
+    total = len(new["steps"])
+    for i, (title, checked) in enumerate(new["steps"]):
+        if i >= len(old["steps"]):
+            events.append({"event": "step_added", "index": i + 1, "step": title, "checked": checked})
+        elif checked != old["steps"][i][1]:
+            kind = "step_checked" if checked else "step_unchecked"
+            events.append({"event": kind, "index": i + 1, "step": title, "done": done, "total": total})
+    for i in range(len(new["steps"]), len(old["steps"])):
+        events.append({"event": "step_removed", "index": i + 1, "step": old["steps"][i][0]})
+
+    for blocker in new["blockers"]:
+        if blocker not in old["blockers"]:
+            events.append({"event": "blocker_added", "text": blocker})
+    for blocker in old["blockers"]:
+        if blocker not in new["blockers"]:
+            events.append({"event": "blocker_removed", "text": blocker})
+    return events
+
+
+class EventStream:
+    """Print JSON-lines events to stdout, stamped with wall time and run elapsed time."""
+
+    def __init__(self):
+        self.start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def emit(self, event: dict):
+        record = {
+            "ts": datetime.now().astimezone().isoformat(timespec="seconds"),
+            "elapsed": round(time.monotonic() - self.start, 1),
+        }
+        record.update(event)
+        # ensure_ascii keeps stdout safe on GBK consoles
+        line = json.dumps(record)
+        with self._lock:
+            print(line, flush=True)
+
+
+class ProgressWatcher(threading.Thread):
+    """Watch codex-progress.md and emit an event for every checklist change."""
+
+    def __init__(self, progress_file: Path, stream: EventStream, interval: float = EVENTS_POLL_INTERVAL):
+        super().__init__(name="progress-watcher", daemon=True)
+        self.progress_file = progress_file
+        self.stream = stream
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._signature = None
+        self.state = self._read()
+
+    def _read(self):
+        try:
+            stat = self.progress_file.stat()
+            self._signature = (stat.st_mtime_ns, stat.st_size)
+            return parse_progress(self.progress_file.read_text(encoding="utf-8-sig"))
+        except OSError:
+            return {"status": "", "steps": [], "blockers": []}
+
+    def check(self):
+        """Re-parse the file if its mtime or size moved, and emit the differences."""
+        try:
+            stat = self.progress_file.stat()
+        except OSError:
+            return
+        if (stat.st_mtime_ns, stat.st_size) == self._signature:
+            return
+        state = self._read()
+        for event in diff_progress(self.state, state):
+            self.stream.emit(event)
+        self.state = state
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.check()  # Catch the final write Codex made just before exiting
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def split_sections(text: str) -> list:
+    """Split markdown into (heading, lines) pairs at "## " headings; the preamble has heading ""."""
+    sections = [("", [])]
+    for line in text.splitlines():
+        if line.startswith("## "):
+            sections.append((line[3:].strip(), []))
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+
+def progress_summary(progress: dict) -> str:
+    """One-line step-count summary of a parse_progress() result."""
+    done = sum(1 for _, checked in progress["steps"] if checked)
+    parts = [f"steps: {done}/{len(progress['steps'])} done"]
+    pending = [title for title, checked in progress["steps"] if not checked]
+    if pending:
+        parts.append(f"next: {pending[0]}")
+    parts.append(f"blockers: {len(progress['blockers'])}")
+    if progress["status"]:
+        parts.append(f"status: {progress['status']}")
+    return " | ".join(parts)
+
+
+def attempts_summary(attempts: list) -> str:
+    """One-line summary of the attempts made under --retries."""
+    parts = [
+        f"{a['attempt']}: {a['exit_reason']} after {a['duration_seconds']}s, "
+        f"steps {a['steps_done']}/{a['steps_total']}"
+        for a in attempts
+    ]
+    return f"attempts: {len(attempts)} ({'; '.join(parts)})"
+
+
+def build_result(exit_label: str, progress_file: Path, out_file: Path, state_dir: Path, full: bool = False,
+                 attempts: list = None, reaped: int = 0, liveness: list = None) -> str:
+    """Build the result for Claude Code: exit reason, progress file, Codex output.
+
+    By default only what changed since the previous report is included: changed
+    lines per progress section and the Codex output if its content is new. The
+    hashes of what was reported are stored in state_dir/report-state.json.
+    With *full*, both files are included verbatim. *attempts* (from --retries)
+    adds a line of per-attempt metrics, *reaped* a count of leftover processes,
+    and *liveness* the stale-check decisions that the log alone would not explain.
+    """
+    progress_text = progress_file.read_text(encoding="utf-8-sig") if progress_file.exists() else None
+    output_text = out_file.read_text(encoding="utf-8-sig") if out_file.exists() else None
+
+    state_path = state_dir / REPORT_STATE_FILE
+    try:
+        previous = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    seen_sections = previous.get("sections", {})
+    state = {"sections": {}, "output": _digest(output_text) if output_text is not None else None}
+
+    result_parts = [f"exit_reason: {exit_label}"]
+    if attempts:
+        result_parts.append(attempts_summary(attempts))
+    if reaped:
+        result_parts.append(f"reaped: {reaped} leftover process(es) from Codex's session were stopped")
+    if liveness:
+        recent = [f"{d['elapsed']:g}s {d['decision']}: {d['reason']}" for d in liveness[-5:]]
+        result_parts.append(f"liveness: {'; '.join(recent)}")
+    if progress_text is not None:
+        result_parts.append(progress_summary(parse_progress(progress_text)))
+
+    if progress_text is not None and full:
+        result_parts.append(f"\n--- codex-progress.md ---\n{progress_text}\n---")
+    elif progress_text is not None:
+        changed, unchanged = [], []
+        # Template guidance lives in HTML comments; it never needs re-reading
+        visible = re.sub(r"<!--.*?-->", "", progress_text, flags=re.DOTALL)
+        for heading, lines in split_sections(visible):
+            lines = [line for line in lines if line.strip()]
+            hashes = [_digest(line) for line in lines]
+            state["sections"][heading] = hashes
+            known = seen_sections.get(heading, [])
+            # Diff as sequences: a repeated line (e.g. a second "  - Tests: passed") is still new
+            runs = [lines[j1:j2] for tag, _, _, j1, j2
+                    in difflib.SequenceMatcher(None, known, hashes, autojunk=False).get_opcodes()
+                    if tag in ("insert", "replace")]
+            if not runs:
+                unchanged.append(heading or "(header)")
+                continue
+            title = f"## {heading}" if heading else "(header)"
+            if known:
+                title += " (changed lines)"
+            changed.append(title + "\n" + "\n...\n".join("\n".join(run) for run in runs))
+        body = "\n\n".join(changed) if changed else "(no changes since last report)"
+        if unchanged and changed:
+            body += f"\n\n(unchanged: {', '.join(unchanged)})"
+        result_parts.append(f"\n--- codex-progress.md (delta) ---\n{body}\n---")
+
+    if output_text is not None:
+        if full or state["output"] != previous.get("output"):
+            result_parts.append(f"\n--- codex output ---\n{output_text}\n---")
+        else:
+            result_parts.append("\n--- codex output ---\n(unchanged since last report)\n---")
+
+    try:
+        if full and progress_text is not None:
+            visible = re.sub(r"<!--.*?-->", "", progress_text, flags=re.DOTALL)
+            state["sections"] = {
+                heading: [_digest(line) for line in lines if line.strip()]
+                for heading, lines in split_sections(visible)
+            }
+        state_path.write_text(json.dumps(state), encoding="utf-8")
+    except OSError:
+        pass
+    return "\n".join(result_parts)
+
+
+class CappedLog:
+    """Binary log that keeps the head and tail of output beyond *max_bytes*.
+
+    Output is written through until the file reaches *max_bytes*; after that
+    only the most recent half of the cap is buffered. close() then cuts the
+    file back to its first half and appends an omission marker and the tail.
+    A *max_bytes* of 0 disables the cap.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = LOG_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.received = 0
+        self.written = 0
+        self._tail = bytearray()
+        self._file = open(path, "wb")
+        # The reader thread may still be writing when the main thread gives up and closes
+        self._lock = threading.Lock()
+
+    def write(self, chunk: bytes):
+        with self._lock:
+            if not self._file.closed:
+                self._write(chunk)
+
+    def _write(self, chunk: bytes):
+        self.received += len(chunk)
+        room = self.max_bytes - self.written if self.max_bytes > 0 else len(chunk)
+        if room > 0:
+            self._file.write(chunk[:room])
+            self._file.flush()
+            self.written += min(room, len(chunk))
+            chunk = chunk[room:]
+        if chunk:
+            tail_cap = self.max_bytes - self.max_bytes // 2
+            self._tail += chunk
+            if len(self._tail) > tail_cap:
+                del self._tail[:len(self._tail) - tail_cap]
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._close()
+
+    def _close(self):
+        if self._tail:
+            head = self.max_bytes // 2
+            omitted = self.received - head - len(self._tail)
+            self._file.seek(head)
+            self._file.truncate()
+            self._file.write(f"\n[... {omitted} bytes omitted by cc-claude-codex (--log-max-bytes) ...]\n".encode())
+            self._file.write(self._tail)
+            self.written = self._file.tell()
+            self._tail = bytearray()
+        self._file.close()
+
+
+def read_log_index(log_dir: Path) -> list:
+    """Entries of logs/index.jsonl, oldest first; unreadable lines are skipped."""
+    try:
+        lines = (log_dir / LOG_INDEX_FILE).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries
+
+
+def record_run(log_dir: Path, entry: dict):
+    try:
+        with (log_dir / LOG_INDEX_FILE).open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass
+
+
+def maintain_logs(log_dir: Path, current_ts: str, keep_runs: int, keep_days: int):
+    """Gzip finished runs before *current_ts* and delete runs beyond retention.
+
+    A run is kept while it is among the newest *keep_runs* and younger than
+    *keep_days* (0 disables either limit); the current run is always kept.
+    """
+    indexed = {entry.get("ts") for entry in read_log_index(log_dir)}
+    runs = {}
+    for path in log_dir.iterdir():
+        m = LOG_NAME_RE.match(path.name)
+        if m:
+            runs.setdefault(m.group(1), []).append(path)
+
+    now = time.time()
+    newest_first = sorted(runs, reverse=True)
+    cutoff = datetime.fromtimestamp(now - keep_days * 86400).strftime("%Y%m%d-%H%M%S") if keep_days > 0 else ""
+    removed = set()
+    for rank, ts in enumerate(newest_first):
+        if ts == current_ts:
+            continue
+        finished = ts in indexed or all(now - p.stat().st_mtime > LOG_ACTIVE_GRACE for p in runs[ts])
+        if not finished:
+            continue
+        if (keep_runs > 0 and rank >= keep_runs) or ts < cutoff:
+            for path in runs[ts]:
+                path.unlink(missing_ok=True)
+            removed.add(ts)
+            continue
+        for path in runs[ts]:
+            if path.suffix != ".gz":
+                gz = path.with_name(path.name + ".gz")
+                tmp = gz.with_name(gz.name + ".tmp")
+                with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                tmp.replace(gz)
+                path.unlink()
+
+    if removed:
+        index_path = log_dir / LOG_INDEX_FILE
+        kept = [entry for entry in read_log_index(log_dir) if entry.get("ts") not in removed]
+        tmp = index_path.with_name(index_path.name + ".tmp")
+        tmp.write_text("".join(json.dumps(entry) + "\n" for entry in kept), encoding="utf-8")
+        tmp.replace(index_path)
+
+
+def latest_write(root: Path, limit: int = WORKSPACE_SCAN_LIMIT) -> int:
+    """Newest mtime (ns) among up to *limit* files under *root*, skipping VCS and dependency dirs."""
+    latest, seen = 0, 0
+    stack = [str(root)]
+    while stack and seen < limit:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in WORKSPACE_SKIP_DIRS:
+                            stack.append(entry.path)
+                        continue
+                    latest = max(latest, entry.stat(follow_symlinks=False).st_mtime_ns)
+                except OSError:
+                    continue
+                seen += 1
+    return latest
+
+
+class Liveness:
+    """Combine several activity signals into the stale decision.
+
+    output     a line of Codex output unlike the recent ones; ANSI codes,
+               digits and carriage-return redraws are ignored, so spinners
+               and counters do not keep a stuck Codex alive
+    progress   codex-progress.md was modified
+    cpu        Codex's session used more than CPU_ACTIVE_SHARE of a CPU
+               (Linux /proc), e.g. a long test suite that prints nothing
+    workspace  a file in the workspace was modified
+
+    Codex is stale once none of them has fired for *stale_timeout* seconds.
+    Every decision that differs from "the log grew" (kept alive without
+    output, or stale despite output) is recorded with its reason.
+    """
+
+    SIGNALS = ("output", "progress", "cpu", "workspace")
+
+    def __init__(self, stale_timeout: int, progress_file: Path, workspace: Path, on_decision=None):
+        self.stale_timeout = stale_timeout
+        self.progress_file = progress_file
+        self.workspace = workspace
+        self.on_decision = on_decision
+        self.start = time.monotonic()
+        self.last = dict.fromkeys(self.SIGNALS, self.start)
+        self.last_bytes = self.start
+        self.pid = None
+        self._lock = threading.Lock()
+        self._seen = {}
+        self._partial = b""
+        self._progress_mtime = self._mtime(progress_file)
+        self._cpu = None
+        self._cpu_at = self.start
+        self._workspace_mtime = latest_write(workspace)
+        self._workspace_at = self.start
+        self._kept_alive = False
+
+    @staticmethod
+    def _mtime(path: Path):
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def attach(self, pid: int):
+        """Start following Codex's session, taking the CPU baseline."""
+        self.pid = pid
+        self._cpu = session_cpu(pid)
+        self._cpu_at = time.monotonic()
+
+    def output(self, chunk: bytes):
+        """Called by the reader thread for every chunk of Codex output."""
+        now = time.monotonic()
+        lines = (self._partial + chunk).replace(b"\r", b"\n").split(b"\n")
+        self._partial = lines.pop()[-4096:]
+        novel = False
+        for line in lines:
+            key = re.sub(rb"\d+", b"", ANSI_RE.sub(b"", line)).strip()
+            if not key:
+                continue
+            if key not in self._seen:
+                novel = True
+                if len(self._seen) >= SEEN_LINES:
+                    del self._seen[next(iter(self._seen))]
+            else:
+                del self._seen[key]  # Move to the most recent end
+            self._seen[key] = None
+        with self._lock:
+            self.last_bytes = now
+            if novel:
+                self.last["output"] = now
+                self._kept_alive = False
+
+    def sample(self):
+        """Poll the progress file, session CPU and (rate-limited) workspace for activity."""
+        now = time.monotonic()
+        mtime = self._mtime(self.progress_file)
+        if mtime != self._progress_mtime:
+            self._progress_mtime = mtime
+            self.last["progress"] = now
+
+        usage = session_cpu(self.pid) if self.pid is not None else None
+        if usage is not None:
+            if self._cpu is not None:
+                # Per-process growth, so a busy worker that exits does not hide the others
+                busy = sum(max(0.0, cpu - self._cpu.get(pid, 0.0)) for pid, cpu in usage.items())
+                if busy > CPU_ACTIVE_SHARE * (now - self._cpu_at):
+                    self.last["cpu"] = now
+            self._cpu, self._cpu_at = usage, now
+
+        quiet = now - max(self.last.values())
+        if quiet >= LIVENESS_INTERVAL and now - self._workspace_at >= WORKSPACE_SCAN_INTERVAL:
+            latest = latest_write(self.workspace)
+            if latest > self._workspace_mtime:
+                self._workspace_mtime = latest
+                self.last["workspace"] = now
+            self._workspace_at = now
+
+    def idle(self, now: float) -> dict:
+        with self._lock:
+            idle = {signal: round(now - at, 1) for signal, at in self.last.items()}
+            idle["output_bytes"] = round(now - self.last_bytes, 1)
+        return idle
+
+    def _decide(self, decision: str, reason: str, idle: dict):
+        record = {"elapsed": round(time.monotonic() - self.start, 1), "decision": decision,
+                  "reason": reason, "idle_seconds": idle}
+        if self.on_decision is not None:
+            self.on_decision(record)
+
+    def deadline(self) -> float:
+        """Monotonic time at which Codex becomes stale unless a signal fires first."""
+        with self._lock:
+            return max(self.last.values()) + self.stale_timeout
+
+    def check(self):
+        """Sample the signals; return a stale exit reason, or None while Codex is alive."""
+        self.sample()
+        now = time.monotonic()
+        idle = self.idle(now)
+        active = min(self.SIGNALS, key=idle.get)
+        if idle[active] < self.stale_timeout:
+            if idle["output_bytes"] >= self.stale_timeout and not self._kept_alive:
+                # The log-growth heuristic alone would have killed Codex here
+                self._kept_alive = True
+                self._decide("alive", f"no output for {idle['output_bytes']:g}s, but {active} activity "
+                                      f"{idle[active]:g}s ago", idle)
+            return None
+        if idle["output_bytes"] < self.stale_timeout:
+            reason = (f"only repeated output for {idle['output']:g}s; "
+                      f"no progress, CPU or workspace activity")
+        else:
+            reason = f"no output, progress, CPU or workspace activity for {idle[active]:g}s"
+        self._decide("stale", reason, idle)
+        return f"stale ({reason})"
+
+
+def supervise(cmd: list, log: CappedLog, max_timeout: int, liveness: Liveness = None, timings: dict = None):
+    """Run Codex, streaming its output into *log* as it arrives.
+
+    A reader thread drains stdout chunk by chunk and feeds *liveness*, while
+    the main thread blocks in proc.wait() until the nearest deadline, waking
+    every LIVENESS_INTERVAL to sample the polled liveness signals. Exit is
+    seen as soon as Codex terminates. Without *liveness* there is no stale check.
+
+    Codex runs in its own session; whatever is left of it on exit or timeout
+    (test runners, dev servers, ...) is stopped with it.
+
+    Returns (returncode, exit_reason, reaped). exit_reason is None on a normal
+    exit; reaped is the number of leftover processes that were stopped.
+    *timings*, if given, receives the "launch" and "first_output" latencies.
+    """
+    timings = {} if timings is None else timings
+    launched = time.monotonic()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, **popen_kwargs())
+    start = time.monotonic()
+    timings["launch"] = start - launched
+    if liveness is not None:
+        liveness.attach(proc.pid)
+
+    def pump():
+        try:
+            for chunk in iter(lambda: proc.stdout.read1(READ_CHUNK), b""):
+                if "first_output" not in timings:
+                    timings["first_output"] = time.monotonic() - start
+                log.write(chunk)
+                if liveness is not None:
+                    liveness.output(chunk)
+        finally:
+            log.close()
+
+    reader = threading.Thread(target=pump, name="codex-output", daemon=True)
+    reader.start()
+
+    exit_reason = None
+    reaped = 0
+    try:
+        while True:
+            deadline, hard = None, False
+            if liveness is not None:
+                deadline = min(liveness.deadline(), time.monotonic() + LIVENESS_INTERVAL)
+            if max_timeout > 0 and (deadline is None or start + max_timeout <= deadline):
+                deadline, hard = start + max_timeout, True
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                if hard:
+                    exit_reason = f"hard_timeout ({max_timeout}s)"
+                    break
+                exit_reason = liveness.check()
+                if exit_reason:
+                    break
+                continue
+            try:
+                proc.wait(timeout=remaining)
+                break  # Process exited
+            except subprocess.TimeoutExpired:
+                continue  # Deadline reached — recompute, activity may have moved it
+    finally:
+        # Graceful first, then forced, for Codex and everything in its session
+        reaped = stop_group(proc.pid, poll=proc.poll)
+        proc.wait()
+        reader.join(DRAIN_GRACE)
+        log.close()
+
+    return proc.returncode, exit_reason, reaped
+
+
 def main():
     configure_stdio()
+    if sys.argv[1:2] == ["stats"]:
+        stats_main(sys.argv[2:], [CODEX_TELEMETRY_FILE])
+        return
 
     parser = argparse.ArgumentParser(description="CC Claude Codex exec wrapper")
     parser.add_argument("--readonly", action="store_true", help="Read-only sandbox")
     parser.add_argument("--max-timeout", type=int, default=0, help="Hard kill timeout in seconds (0=no limit)")
-    parser.add_argument("--stale-timeout", type=int, default=120, help="Seconds without log activity before killing Codex (default: 120)")
+    parser.add_argument("--stale-timeout", type=int, default=120, help="Seconds without any sign of life (new output, progress edits, CPU use, "
+                             "workspace writes) before killing Codex (default: 120, 0=disabled)")
     parser.add_argument("--sandbox", default=None, help="Sandbox mode override")
+    parser.add_argument("--events", action="store_true",
+                        help="Stream JSON-lines progress events to stdout while Codex runs; "
+                             "the result is the final 'exit' event")
+    parser.add_argument("--full", action="store_true",
+                        help="Print codex-progress.md and the Codex output in full instead of only "
+                             "what changed since the last report")
+    parser.add_argument("--log-max-bytes", type=int, default=LOG_MAX_BYTES,
+                        help="Cap on each run's log; beyond it only the head and tail are kept "
+                             f"(default: {LOG_MAX_BYTES}, 0=unlimited)")
+    parser.add_argument("--log-keep-runs", type=int, default=LOG_KEEP_RUNS,
+                        help=f"Runs whose logs are kept (default: {LOG_KEEP_RUNS}, 0=no limit)")
+    parser.add_argument("--log-keep-days", type=int, default=LOG_KEEP_DAYS,
+                        help=f"Delete logs of runs older than this many days (default: {LOG_KEEP_DAYS}, 0=no limit)")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="Relaunch Codex up to N times after a stale/hard timeout or error exit while "
+                             "codex-progress.md has unchecked steps and no blockers (default: 0)")
+    parser.add_argument("--backoff", type=float, default=5.0,
+                        help="Seconds before the first retry, doubled for each further one (default: 5)")
+    parser.add_argument("--no-telemetry", action="store_true",
+                        help=f"Do not append phase timings to {CODEX_TELEMETRY_FILE.as_posix()}")
     args = parser.parse_args()
 
     # Resolve full path — required on Windows where .cmd shims aren't found by Popen
@@ -87,98 +745,156 @@ def main():
     log_file = log_dir / f"codex-{ts}.log"
     out_file = log_dir / f"codex-{ts}-output.md"
 
-    cmd = [
-        codex_bin,
-        "exec",
-        "--sandbox",
-        sandbox,
-        "-o",
-        str(out_file),
-        CODEX_PROMPT,
-    ]
-
-    proc = None
-    lf = None
-    try:
-        lf = open(log_file, "w", encoding="utf-8")
-        proc = subprocess.Popen(cmd, stdout=lf, stderr=subprocess.STDOUT, text=True)
-
-        start = time.time()
-        last_activity = time.time()
-        poll_interval = 30
-        stale_timeout = args.stale_timeout
-        max_timeout = args.max_timeout
-        exit_reason = None
-        last_log_size = 0
-
-        # Poll loop: check log file size growth for health
-        while True:
-            try:
-                proc.wait(timeout=poll_interval)
-                break  # Process exited
-            except subprocess.TimeoutExpired:
-                now = time.time()
-
-                # Hard kill if max-timeout exceeded
-                if max_timeout > 0 and int(now - start) >= max_timeout:
-                    proc.kill()
-                    proc.wait()
-                    exit_reason = f"hard_timeout ({max_timeout}s)"
-                    break
-
-                # Stale check: compare actual file size on disk
-                current_size = log_file.stat().st_size
-                if current_size > last_log_size:
-                    last_log_size = current_size
-                    last_activity = time.time()
-                elif int(now - last_activity) >= stale_timeout:
-                    proc.kill()
-                    proc.wait()
-                    exit_reason = f"stale ({stale_timeout}s no log activity)"
-                    break
-
-        lf.close()
-
-        # Build result for Claude Code: 3 pieces of info
-        result_parts = []
-
-        # 1. Exit reason
-        if exit_reason:
-            result_parts.append(f"exit_reason: {exit_reason}")
-        elif proc.returncode != 0:
-            result_parts.append(f"exit_reason: error (code={proc.returncode})")
+    def codex_cmd(prompt: str, out_path: Path) -> list:
+        return [
+            codex_bin,
+            "exec",
+            "--sandbox",
+            sandbox,
+            "-o",
+            str(out_path),
+            prompt,
+        ]
+
+    def read_progress() -> dict:
+        try:
+            return parse_progress(progress_file.read_text(encoding="utf-8-sig"))
+        except OSError:
+            return {"status": "", "steps": [], "blockers": []}
+
+    stream, watcher = None, None
+    if args.events:
+        stream = EventStream()
+        watcher = ProgressWatcher(progress_file, stream)
+        state = watcher.state
+        stream.emit({
+            "event": "started", "log_file": str(log_file), "status": state["status"],
+            "done": sum(1 for _, checked in state["steps"] if checked), "total": len(state["steps"]),
+        })
+        watcher.start()
+
+    started = time.monotonic()
+    attempts = []
+    logs = []
+    decisions = []
+    telemetry = Recorder(CODEX_TELEMETRY_FILE, "codex", ts, enabled=not args.no_telemetry)
+
+    def on_decision(record: dict):
+        if args.retries > 0:
+            record["attempt"] = len(attempts) + 1
+        if len(decisions) < MAX_DECISIONS:
+            decisions.append(record)
+        if stream is not None:
+            stream.emit(dict({"event": "liveness"}, **record))
+
+    def finish_attempt(log: CappedLog, attempt_started: float, exit_label: str, exit_code: int,
+                       reaped: int = 0, timings: dict = None) -> dict:
+        log.close()
+        for phase, seconds in (timings or {}).items():
+            telemetry.phase("codex", phase, seconds)
+        telemetry.phase("codex", "run", time.monotonic() - attempt_started, outcome=exit_label.split(" ")[0])
+        progress = read_progress()
+        record = {
+            "attempt": len(attempts) + 1, "exit_reason": exit_label, "exit_code": exit_code,
+            "duration_seconds": round(time.monotonic() - attempt_started, 1),
+            "steps_done": sum(1 for _, checked in progress["steps"] if checked),
+            "steps_total": len(progress["steps"]), "log": log.path.name, "log_bytes": log.written,
+            "output": out_file.name, "reaped_processes": reaped,
+        }
+        attempts.append(record)
+        return progress
+
+    def report(exit_label: str, exit_code: int):
+        if watcher is not None:
+            watcher.stop()
+        entry = {
+            "ts": ts, "log": log_file.name, "output": out_file.name,
+            "exit_reason": exit_label, "exit_code": exit_code,
+            "duration_seconds": round(time.monotonic() - started, 1),
+            "log_bytes": sum(log.written for log in logs),
+            "log_received_bytes": sum(log.received for log in logs),
+            "output_bytes": out_file.stat().st_size if out_file.exists() else 0,
+            "reaped_processes": sum(a["reaped_processes"] for a in attempts),
+        }
+        if decisions:
+            entry["liveness"] = decisions
+        telemetry.phase("codex", "total", time.monotonic() - started, outcome=exit_label.split(" ")[0])
+        telemetry.flush()
+        if args.retries > 0:
+            entry["attempts"] = attempts
+        record_run(log_dir, entry)
+        try:
+            maintain_logs(log_dir, ts, args.log_keep_runs, args.log_keep_days)
+        except OSError as e:
+            print(f"Warning: log maintenance failed: {e}", file=sys.stderr)
+        result = build_result(exit_label, progress_file, out_file, state_dir, full=args.full,
+                              attempts=attempts if args.retries > 0 else None,
+                              reaped=entry["reaped_processes"], liveness=decisions)
+        if stream is not None:
+            event = {"event": "exit", "exit_reason": exit_label, "exit_code": exit_code, "result": result}
+            if decisions:
+                event["liveness"] = decisions
+            if args.retries > 0:
+                event["attempts"] = attempts
+            stream.emit(event)
         else:
-            result_parts.append("exit_reason: done")
-
-        # 2. Progress file
-        if progress_file.exists():
-            result_parts.append(f"\n--- codex-progress.md ---\n{progress_file.read_text(encoding='utf-8-sig')}\n---")
-
-        # 3. Codex final output
-        if out_file.exists():
-            result_parts.append(f"\n--- codex output ---\n{out_file.read_text(encoding='utf-8-sig')}\n---")
-
-        print("\n".join(result_parts))
+            print(result)
+        sys.exit(exit_code)
+
+    prompt = CODEX_PROMPT
+    while True:
+        # Each attempt gets its own output file, so one that dies before Codex
+        # writes its final message cannot report the previous attempt's
+        if attempts:
+            attempt_log = log_dir / f"codex-{ts}-attempt{len(attempts) + 1}.log"
+            out_file = log_dir / f"codex-{ts}-attempt{len(attempts) + 1}-output.md"
+        else:
+            attempt_log = log_file
+        log = CappedLog(attempt_log, args.log_max_bytes)
+        logs.append(log)
+        attempt_started = time.monotonic()
+        timings = {}
+        liveness = None
+        if args.stale_timeout > 0:
+            liveness = Liveness(args.stale_timeout, progress_file, Path.cwd(), on_decision)
+        try:
+            returncode, exit_reason, reaped = supervise(codex_cmd(prompt, out_file), log, args.max_timeout, liveness, timings)
+        except KeyboardInterrupt:
+            # supervise() has already killed Codex on the way out
+            finish_attempt(log, attempt_started, "interrupted", 130, timings=timings)
+            report("interrupted", 130)
 
         # Exit code: 0 for done, 1 for error, 124 for timeout/stale
         if exit_reason:
-            sys.exit(124)
-        elif proc.returncode != 0:
-            sys.exit(1)
-
-    except KeyboardInterrupt:
-        if proc and proc.poll() is None:
-            proc.kill()
-            proc.wait()
-        if lf and not lf.closed:
-            lf.close()
-        result_parts = ["exit_reason: interrupted"]
-        if progress_file.exists():
-            result_parts.append(f"\n--- codex-progress.md ---\n{progress_file.read_text(encoding='utf-8-sig')}\n---")
-        if out_file.exists():
-            result_parts.append(f"\n--- codex output ---\n{out_file.read_text(encoding='utf-8-sig')}\n---")
-        print("\n".join(result_parts))
-        sys.exit(130)
+            exit_label, exit_code = exit_reason, 124
+        elif returncode != 0:
+            exit_label, exit_code = f"error (code={returncode})", 1
+        else:
+            exit_label, exit_code = "done", 0
+        progress = finish_attempt(log, attempt_started, exit_label, exit_code, reaped, timings)
+
+        # Retry only what Codex could finish on its own; blockers need the supervisor
+        pending = [title for title, checked in progress["steps"] if not checked]
+        if exit_code == 0 or len(attempts) > args.retries or not pending or progress["blockers"]:
+            break
+
+        delay = args.backoff * 2 ** (len(attempts) - 1)
+        # Steps can be checked out of order, so locate the first unchecked one
+        index = next(i for i, (_, checked) in enumerate(progress["steps"], 1) if not checked)
+        if stream is not None:
+            stream.emit({"event": "retry", "attempt": len(attempts) + 1, "after": exit_label,
+                         "delay_seconds": delay, "index": index, "step": pending[0]})
+        else:
+            print(f"Codex ended with {exit_label}; retry {len(attempts)}/{args.retries} "
+                  f"from step {index} in {delay:g}s", file=sys.stderr)
+        try:
+            time.sleep(delay)
+        except KeyboardInterrupt:
+            report("interrupted", 130)
+        prompt = CODEX_PROMPT + RESUME_PROMPT.format(
+            attempt=len(attempts) + 1, reason=exit_label, index=index, step=pending[0])
+
+    report(exit_label, exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+﻿#!/usr/bin/env python3
+"""Thin hook entry point that forwards events to hook_daemon.py.
+
+Usage: python hook_client.py <stop|pre-compact|session-start> [hook args...]
+
+Sends the hook input (stdin JSON) to the per-user hook daemon over its Unix
+socket and replays the daemon's stdout, stderr and exit code. If the daemon is
+not running (or the platform has no Unix sockets) the hook script is run
+in-process instead, and a daemon is started in the background for the next
+event. The fast path imports only os, socket, stat and sys.
+
+The socket is trusted only inside a directory this user owns with mode 0700
+and only if the socket itself is owned by this user; otherwise (e.g. another
+local user created the directory first) the hook runs in-process.
+
+Wire format (one request per connection):
+  request:  b"<hook>\0<cwd>\0<arg>..." b"\n" <raw hook input>
+  response: b"ok <exit code> <stdout length>\n" <stdout> <stderr>, or any other
+            first line (e.g. b"stale") to make the client fall back
+
+The client falls back to running the hook itself only when the daemon cannot
+be reached or says it did not run the hook. Once a request is sent, a missing,
+late or truncated answer fails the hook without rerunning it, since the
+daemon may already have run it.
+"""
+
+import os
+import socket
+import stat
+import sys
+
+HOOK_SCRIPTS = {
+    "stop": "stop_check.py",
+    "pre-compact": "pre_compact.py",
+    "session-start": "session_inject.py",
+}
+
+CONNECT_TIMEOUT = 0.2
+# Once the request is sent the hook may already be running: wait, never rerun
+RESPONSE_TIMEOUT = 30.0
+
+
+def socket_path() -> str:
+    """Per-user socket location, in a directory only the user can access."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "cc-claude-codex", "hooks.sock")
+    return os.path.join("/tmp", f"cc-claude-codex-{os.getuid()}", "hooks.sock")
+
+
+def private_dir(path: str) -> bool:
+    """True if *path* is a real directory (not a symlink) owned by this user with mode 0700."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and stat.S_IMODE(st.st_mode) == 0o700
+
+
+def trusted_socket(path: str) -> bool:
+    """True if *path* is a socket owned by this user in a private directory."""
+    if not private_dir(os.path.dirname(path)):
+        return False
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def ask_daemon(header: bytes, raw_input: bytes):
+    """Return (exit code, stdout, stderr) for the hook, or None if the caller should run it.
+
+    None means the daemon was unreachable or declined the request. Failures
+    after the request was sent come back as a failed result instead.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path()
+    if not trusted_socket(path):
+        return None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(path)
+            sock.settimeout(RESPONSE_TIMEOUT)
+            sock.sendall(header + b"\n" + raw_input)
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            return None
+        chunks = []
+        try:
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except OSError as e:
+            return unanswered(f"no complete answer from the hook daemon ({e})")
+    status, newline, body = b"".join(chunks).partition(b"\n")
+    fields = status.split()
+    if not newline:
+        return unanswered("the hook daemon closed the connection without answering")
+    if not fields or fields[0] != b"ok":
+        return None  # "stale", "unknown-hook", "error ...": the hook was not run
+    try:
+        code, out_len = int(fields[1]), int(fields[2])
+    except (IndexError, ValueError):
+        return unanswered(f"malformed answer from the hook daemon: {status[:80]!r}")
+    if out_len > len(body):
+        return unanswered("truncated answer from the hook daemon")
+    return code, body[:out_len], body[out_len:]
+
+
+def unanswered(reason: str):
+    """Fail the hook without rerunning it; the daemon may already have run it."""
+    return 1, b"", f"hook_client: {reason}; not rerunning the hook\n".encode("utf-8", "replace")
+
+
+def start_daemon(scripts_dir: str):
+    """Spawn a detached daemon; it exits on its own if one is already running."""
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.join(scripts_dir, "hook_daemon.py")],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def run_in_process(script: str, raw_input: bytes, cwd: str, args: list):
+    """Run the hook script as __main__ with the already-consumed stdin."""
+    import io
+    import json
+    import runpy
+
+    try:
+        hook_input = json.loads(raw_input)
+    except ValueError:
+        hook_input = {}
+    if isinstance(hook_input, dict):
+        hook_input.setdefault("cwd", cwd)
+    sys.argv = [script] + args
+    sys.stdin = io.StringIO(json.dumps(hook_input))
+    sys.path.insert(0, os.path.dirname(script))
+    runpy.run_path(script, run_name="__main__")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in HOOK_SCRIPTS:
+        print(f"Usage: hook_client.py <{'|'.join(HOOK_SCRIPTS)}> [args...]", file=sys.stderr)
+        sys.exit(0)
+    hook, args = sys.argv[1], sys.argv[2:]
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    # The daemon runs elsewhere; the hook's own cwd is the fallback project directory
+    cwd = os.getcwd()
+
+    raw_input = sys.stdin.buffer.read()
+    header = "\0".join([hook, cwd] + args).encode("utf-8", "surrogateescape")
+    response = ask_daemon(header, raw_input)
+    if response is None:
+        sock_dir = os.path.dirname(socket_path()) if hasattr(socket, "AF_UNIX") else None
+        # A daemon would refuse a directory someone else owns; don't respawn one per event
+        if (sock_dir is not None and os.environ.get("CC_CLAUDE_CODEX_NO_DAEMON") != "1"
+                and (not os.path.lexists(sock_dir) or private_dir(sock_dir))):
+            start_daemon(scripts_dir)
+        run_in_process(os.path.join(scripts_dir, HOOK_SCRIPTS[hook]), raw_input, cwd, args)
+        return
+
+    code, out, err = response
+    sys.stdout.buffer.write(out)
+    sys.stderr.buffer.write(err)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
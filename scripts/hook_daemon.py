@@ -0,0 +1,225 @@
+﻿#!/usr/bin/env python3
+"""Optional long-lived server for the Stop, PreCompact and SessionStart hooks.
+
+Removes the per-event interpreter startup: hook_client.py forwards each event
+over a per-user Unix socket and this process runs the hook in-process, with
+the parsed status index kept in memory between events.
+
+Usage:
+  python hook_daemon.py [--idle-timeout SECONDS]   # serve (started automatically by hook_client.py)
+  python hook_daemon.py --status
+  python hook_daemon.py --stop
+
+Only one daemon runs per user (guarded by a lock file next to the socket). The
+socket directory must be owned by the user with mode 0700; the daemon refuses
+to start in one that is not (another local user may have created it). It
+exits after --idle-timeout seconds without events, on SIGTERM, or when any of
+the skill's scripts change on disk so an upgraded install is picked up.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from hook_client import HOOK_SCRIPTS, private_dir, socket_path
+
+DEFAULT_IDLE_TIMEOUT = 1800
+MAX_REQUEST_BYTES = 1024 * 1024
+# How often the accept loop wakes to notice a SIGTERM
+POLL_INTERVAL = 0.5
+
+# Set by the SIGTERM handler; serve() finishes the current event, then exits.
+# Raising SystemExit from the handler instead would be caught by run_hook as
+# the running hook's own exit.
+shutdown_requested = False
+
+
+def request_shutdown(signum, frame):
+    global shutdown_requested
+    shutdown_requested = True
+
+
+def source_signature(scripts_dir: Path) -> dict:
+    return {f.name: f.stat().st_mtime_ns for f in scripts_dir.glob("*.py")}
+
+
+def lock_daemon(lock_file: Path):
+    """Take the per-user daemon lock, or return None if another daemon holds it."""
+    import fcntl
+
+    f = lock_file.open("a+")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    f.seek(0)
+    f.truncate()
+    f.write(str(os.getpid()))
+    f.flush()
+    return f
+
+
+def read_pid(lock_file: Path):
+    try:
+        return int(lock_file.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def run_hook(module, args: list, hook_input: dict) -> bytes:
+    """Call a hook's main() with redirected stdio; returns the encoded response."""
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    saved_argv, saved_stdin = sys.argv, sys.stdin
+    sys.argv = [module.__file__] + args
+    sys.stdin = io.StringIO(json.dumps(hook_input))
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            module.main()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            err.write(f"{e.code}\n")
+            code = 1
+    except Exception:
+        err.write(traceback.format_exc())
+        code = 1
+    finally:
+        sys.argv, sys.stdin = saved_argv, saved_stdin
+    stdout, stderr = out.getvalue().encode("utf-8"), err.getvalue().encode("utf-8")
+    return f"ok {code} {len(stdout)}\n".encode("ascii") + stdout + stderr
+
+
+def read_request(conn: socket.socket) -> tuple:
+    """Parse a client request into (hook, args, hook input)."""
+    chunks, total = [], 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        total += len(chunk)
+        if total > MAX_REQUEST_BYTES:
+            raise ValueError("request too large")
+    header, _, raw_input = b"".join(chunks).partition(b"\n")
+    hook, cwd, *args = header.decode("utf-8", "surrogateescape").split("\0")
+    try:
+        hook_input = json.loads(raw_input)
+    except ValueError:
+        hook_input = {}
+    if not isinstance(hook_input, dict):
+        hook_input = {}
+    hook_input.setdefault("cwd", cwd)
+    return hook, args, hook_input
+
+
+def serve(sock_path: Path, idle_timeout: float):
+    scripts_dir = Path(__file__).resolve().parent
+    signature = source_signature(scripts_dir)
+    modules = {hook: importlib.import_module(Path(name).stem) for hook, name in HOOK_SCRIPTS.items()}
+
+    if sock_path.exists() or sock_path.is_symlink():
+        sock_path.unlink()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(str(sock_path))
+        server.listen(16)
+        server.settimeout(POLL_INTERVAL)
+        last_event = time.monotonic()
+        while not shutdown_requested:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                if idle_timeout > 0 and time.monotonic() - last_event >= idle_timeout:
+                    return
+                continue
+            with conn:
+                conn.settimeout(5.0)
+                stale = source_signature(scripts_dir) != signature
+                try:
+                    hook, args, hook_input = read_request(conn)
+                    module = modules.get(hook)
+                    if stale or module is None:
+                        response = b"stale\n" if stale else b"unknown-hook\n"
+                    else:
+                        response = run_hook(module, args, hook_input)
+                except (OSError, ValueError) as e:
+                    response = f"error {e}\n".encode("utf-8", "replace")
+                try:
+                    conn.sendall(response)
+                except OSError:
+                    pass
+                if stale:
+                    # Let the next client start a daemon running the new code
+                    return
+            last_event = time.monotonic()
+    finally:
+        server.close()
+        try:
+            sock_path.unlink()
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CC Claude Codex hook daemon")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help=f"Exit after this many seconds without events, 0 = never (default: {DEFAULT_IDLE_TIMEOUT})")
+    parser.add_argument("--status", action="store_true", help="Report whether a daemon is running")
+    parser.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    args = parser.parse_args()
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: the hook daemon requires Unix domain sockets.", file=sys.stderr)
+        sys.exit(1)
+
+    sock_path = Path(socket_path())
+    lock_file = sock_path.with_name("hooks.lock")
+    try:
+        sock_path.parent.mkdir(mode=0o700, parents=True)
+        os.chmod(sock_path.parent, 0o700)  # Ours, just created; undo any umask narrowing
+    except FileExistsError:
+        pass
+    if not private_dir(str(sock_path.parent)):
+        print(f"Error: {sock_path.parent} is not a directory owned by you with mode 0700; "
+              f"refusing to use it. Remove it (or set XDG_RUNTIME_DIR) and retry.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.status or args.stop:
+        lock = lock_daemon(lock_file)
+        if lock is not None:
+            lock.close()
+            print("Hook daemon is not running.")
+            return
+        pid = read_pid(lock_file)
+        if args.stop and pid:
+            os.kill(pid, signal.SIGTERM)
+            print(f"Stopped hook daemon (pid {pid}).")
+        else:
+            print(f"Hook daemon running (pid {pid}), socket {sock_path}")
+        return
+
+    lock = lock_daemon(lock_file)
+    if lock is None:
+        # Another daemon already serves this user
+        return
+    signal.signal(signal.SIGTERM, request_shutdown)
+    try:
+        serve(sock_path, args.idle_timeout)
+    finally:
+        lock.close()
+
+
+if __name__ == "__main__":
+    main()
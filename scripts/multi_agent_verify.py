@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """Multi-agent verification orchestrator.
 
-Launches OpenCode and Codex CLI agents in separate worktrees,
-monitors their progress, enforces timeouts, and collects results.
+Launches CLI agents (OpenCode and Codex by default, or those defined in an
+agents config file) in separate worktrees, schedules them under a
+parallelism limit, enforces timeouts, and collects results.
 
 Claude agent is NOT managed here — it runs via Task tool with
 isolation: "worktree" directly from the main agent.
@@ -13,21 +14,31 @@ Usage:
         --timestamp 20260228-020854 \
         --prompt-file /path/to/prompt.md \
         [--timeout 600]
+    python multi_agent_verify.py stats [--since 7d] [--agent NAME] [--json]   # from the repo root
+    python multi_agent_verify.py release --repo-root /path/to/repo --timestamp 20260228-020854
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import fnmatch
+import hashlib
 import json
 import os
 import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
 from typing import Any
 
+from process_group import TERM_GRACE, popen_kwargs, stop_group
+from telemetry import VERIFY_TELEMETRY_FILE, Recorder, stats_main
+
 IS_WINDOWS = sys.platform == "win32"
 
 # Subprocess defaults for Windows encoding compatibility
@@ -36,24 +47,80 @@ if IS_WINDOWS:
     _SUBPROCESS_TEXT_KWARGS["encoding"] = "utf-8"
     _SUBPROCESS_TEXT_KWARGS["errors"] = "replace"
 
+# Agent output handling: full output streams to disk, only a small tail stays in memory
+READ_CHUNK = 64 * 1024
+TAIL_BUFFER_BYTES = 4096
+ERROR_TAIL_CHARS = 500
+DRAIN_GRACE = 5.0
+
+# Supporting directories added to sparse worktrees next to the changed files' own
+DEFAULT_SPARSE_INCLUDE = ["test", "tests", "__tests__", "spec"]
+
+# How often agent process trees are sampled for CPU / RSS accounting (Linux /proc)
+RESOURCE_SAMPLE_INTERVAL = 1.0
+# Agents run under this wrapper on POSIX so their exit rusage is recorded
+RUSAGE_WRAPPER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rusage_wrapper.py")
+
+# Default --max-parallel budget: one agent per this many CPUs / bytes of free memory
+CPUS_PER_AGENT = 1
+MEMORY_PER_AGENT = 2 * 1024 ** 3
+
+# Warm worktrees kept under .claude/worktrees/verify-pool-{i} (0 = fresh worktree per agent)
+DEFAULT_POOL_SIZE = 4
+# A run leases its pool slots until `release` (Phase V5); leases older than this are stale
+POOL_LEASE_MAX_AGE = 24 * 3600
+
+# How agents receive the prompt: as the last argument, on stdin, or via a file
+# named in the command ({prompt_file}) or in a short pointer prompt. "auto" uses
+# the argument unless the prompt nears the OS limit (MAX_ARG_STRLEN is 128 KiB
+# on Linux; Windows command lines top out at 32K characters, 8K through cmd.exe).
+PROMPT_TRANSPORTS = ("auto", "arg", "stdin", "file")
+ARG_PROMPT_LIMIT = 8000 if IS_WINDOWS else 100 * 1024
+PROMPT_FILE_PLACEHOLDER = "{prompt_file}"
+POINTER_PROMPT = ("Your complete instructions are in the file {path} (outside this worktree). "
+                  "Read that whole file first and follow it exactly.")
+
+# Reports of successful runs cached under .claude/verify-cache/, keyed by tree + prompt + agents.
+# Entries carry each agent's patch and _verify_* files, since its worktree and log do not last.
+CACHE_VERSION = 2
+DEFAULT_CACHE_MAX_BYTES = 20 * 1024 ** 2
+DEFAULT_CACHE_MAX_AGE_DAYS = 7
+
+# Concurrent `git worktree add/remove/prune` calls race on .git/worktrees/
+# (one reads another's half-written admin dir), so registration is serialized;
+# checkouts still run in parallel.
+_worktree_admin_lock = threading.Lock()
+
 
 @dataclass
 class AgentConfig:
     name: str
     cli_cmd: list[str]
+    timeout: int = 0  # seconds; 0 = use the run's --timeout
+    weight: int = 1  # scheduler slots this agent occupies while running
+    prompt_via: str = "auto"  # auto | arg | stdin | file (see PROMPT_TRANSPORTS)
     worktree_dir: str = ""
 
 
 @dataclass
 class AgentResult:
     name: str
-    status: str = "pending"  # pending | running | completed | failed | timeout
+    status: str = "pending"  # pending | running | completed | failed | timeout | cancelled
     exit_code: int | None = None
     duration_seconds: float = 0.0
     files_changed: int = 0
     committed: bool = False
     commit_hash: str = ""
     error: str = ""
+    log_file: str = ""
+    file_stats: list[dict[str, Any]] = field(default_factory=list)
+    # Resource usage of the agent's whole process tree (sampled from /proc on Linux)
+    cpu_user_seconds: float = 0.0
+    cpu_system_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    process_count: int = 0
+    # Processes left in the agent's session when it exited or was stopped (Linux)
+    reaped_processes: int = 0
 
 
 AGENTS = [
@@ -62,19 +129,420 @@ AGENTS = [
 ]
 
 
+class OutputDrain:
+    """Continuously copy a process's output to a log file on a background thread.
+
+    Keeps the pipe empty so a chatty agent never blocks on a full buffer, and
+    holds only the last *tail_bytes* of output in memory for error reporting.
+    """
+
+    def __init__(self, stream: Any, log_path: str, tail_bytes: int = TAIL_BUFFER_BYTES) -> None:
+        self.log_path = log_path
+        self.bytes_total = 0
+        self.first_output_at: float | None = None  # time.monotonic() of the first chunk
+        self._stream = stream
+        self._tail_bytes = tail_bytes
+        self._tail = bytearray()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"drain-{os.path.basename(log_path)}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            with open(self.log_path, "wb") as lf:
+                for chunk in iter(lambda: self._stream.read1(READ_CHUNK), b""):
+                    if self.first_output_at is None:
+                        self.first_output_at = time.monotonic()
+                    lf.write(chunk)
+                    lf.flush()
+                    with self._lock:
+                        self.bytes_total += len(chunk)
+                        self._tail += chunk
+                        if len(self._tail) > self._tail_bytes:
+                            del self._tail[:-self._tail_bytes]
+        except (OSError, ValueError) as e:
+            print(f"[orchestrator] Output drain for {self.log_path} stopped: {e}", file=sys.stderr)
+        finally:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for the drain to reach EOF (bounded, since grandchildren may hold the pipe)."""
+        self._thread.join(timeout)
+
+    def tail(self, max_chars: int = ERROR_TAIL_CHARS) -> str:
+        """Return the last *max_chars* characters of output seen so far."""
+        with self._lock:
+            data = bytes(self._tail)
+        return data.decode("utf-8", errors="replace")[-max_chars:]
+
+
+def load_agents(path: str) -> list[AgentConfig]:
+    """Load agent definitions from a JSON config file.
+
+    Format::
+
+        {"agents": [
+            {"name": "opencode", "command": ["opencode", "run"], "timeout": 600, "weight": 1},
+            {"name": "codex", "command": ["codex", "exec", "--full-auto", "-"], "prompt_via": "stdin"}
+        ]}
+
+    ``command`` is the argv prefix. ``prompt_via`` picks the prompt transport:
+    ``arg`` appends the prompt as the last argument, ``stdin`` feeds it on
+    standard input, ``file`` writes it to a per-agent file whose path replaces
+    ``{prompt_file}`` in the command (or is named in a short appended prompt),
+    and ``auto`` (the default) is ``arg`` unless the prompt is too large for
+    the command line, then ``file``. ``timeout``, ``weight`` and ``prompt_via``
+    are optional. Raises ValueError on malformed input.
+    """
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"cannot read agent config {path}: {e}") from e
+
+    entries = data.get("agents") if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty \"agents\" list")
+
+    agents: list[AgentConfig] = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}: agents[{i}] must be an object")
+        name = entry.get("name")
+        command = entry.get("command")
+        if isinstance(command, str):
+            command = command.split()
+        if not isinstance(name, str) or not name:
+            raise ValueError(f"{path}: agents[{i}] needs a \"name\"")
+        if not isinstance(command, list) or not command or not all(isinstance(c, str) for c in command):
+            raise ValueError(f"{path}: agent {name!r} needs a non-empty \"command\" list")
+        if any(a.name == name for a in agents):
+            raise ValueError(f"{path}: duplicate agent name {name!r}")
+        timeout = entry.get("timeout", 0)
+        weight = entry.get("weight", 1)
+        if not isinstance(timeout, int) or timeout < 0:
+            raise ValueError(f"{path}: agent {name!r} has an invalid \"timeout\"")
+        if not isinstance(weight, int) or weight < 1:
+            raise ValueError(f"{path}: agent {name!r} has an invalid \"weight\"")
+        prompt_via = entry.get("prompt_via", "auto")
+        if prompt_via not in PROMPT_TRANSPORTS:
+            raise ValueError(f"{path}: agent {name!r} has an invalid \"prompt_via\" "
+                             f"(expected one of {', '.join(PROMPT_TRANSPORTS)})")
+        agents.append(AgentConfig(name=name, cli_cmd=command, timeout=timeout, weight=weight, prompt_via=prompt_via))
+    return agents
+
+
+def _available_memory() -> int | None:
+    """Return available physical memory in bytes, or None if unknown."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_max_parallel() -> int:
+    """Derive a parallelism limit from CPU count and available memory.
+
+    Never below the number of default agents: they mostly wait on model APIs,
+    so even a small host runs the default set side by side.
+    """
+    limit = max(1, (os.cpu_count() or 2) // CPUS_PER_AGENT)
+    memory = _available_memory()
+    if memory is not None:
+        limit = min(limit, max(1, memory // MEMORY_PER_AGENT))
+    return max(limit, len(AGENTS))
+
+
+class WeightedLimiter:
+    """Admit agents while their summed weight stays within *capacity*; the rest wait."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.in_use = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self, weight: int) -> int:
+        """Wait for *weight* free slots (clamped to capacity); returns the weight taken."""
+        weight = min(weight, self.capacity)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_use + weight <= self.capacity)
+            self.in_use += weight
+        return weight
+
+    async def release(self, weight: int) -> None:
+        async with self._cond:
+            self.in_use -= weight
+            self._cond.notify_all()
+
+
+def read_proc_table() -> dict[int, tuple[int, float, float, int, int]]:
+    """Return pid -> (ppid, user_seconds, system_seconds, rss_bytes, session id) from /proc.
+
+    CPU times include the cutime/cstime of already-reaped children, so summing
+    a live tree also covers descendants that have come and gone.
+    """
+    ticks = os.sysconf("SC_CLK_TCK")
+    page = os.sysconf("SC_PAGE_SIZE")
+    table: dict[int, tuple[int, float, float, int, int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                data = f.read().decode("ascii", errors="replace")
+        except OSError:
+            continue  # Exited while we were scanning
+        # Fields after "(comm)", which may itself contain spaces and parentheses
+        fields = data[data.rindex(")") + 2:].split()
+        try:
+            user = (int(fields[11]) + int(fields[13])) / ticks
+            system = (int(fields[12]) + int(fields[14])) / ticks
+            table[int(entry)] = (int(fields[1]), user, system, int(fields[21]) * page, int(fields[3]))
+        except (IndexError, ValueError):
+            continue
+    return table
+
+
+@dataclass
+class TreeUsage:
+    cpu_user_seconds: float = 0.0
+    cpu_system_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    pids: set[int] = field(default_factory=set)
+    # Latest CPU of session members no longer below the agent; their time never
+    # reaches the agent's exit rusage
+    orphan_cpu: dict[int, tuple[float, float]] = field(default_factory=dict)
+
+    def add_exit_rusage(self, exit_usage: dict[str, Any]) -> None:
+        """Fold in the agent's exit rusage (rusage_wrapper.py).
+
+        It is exact for the agent and everything it reaped, however briefly it
+        ran; processes orphaned into the session are added from the samples.
+        """
+        self.cpu_user_seconds = max(self.cpu_user_seconds, exit_usage["cpu_user_seconds"]
+                                    + sum(user for user, _ in self.orphan_cpu.values()))
+        self.cpu_system_seconds = max(self.cpu_system_seconds, exit_usage["cpu_system_seconds"]
+                                      + sum(system for _, system in self.orphan_cpu.values()))
+        self.peak_rss_bytes = max(self.peak_rss_bytes, exit_usage["max_rss_bytes"])
+        if exit_usage.get("pid"):
+            self.pids.add(exit_usage["pid"])
+
+
+def read_exit_rusage(path: str) -> dict[str, Any] | None:
+    """Read and remove the record rusage_wrapper.py wrote, or None if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        os.remove(path)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict) or not all(
+            isinstance(record.get(k), (int, float)) for k in ("cpu_user_seconds", "cpu_system_seconds", "max_rss_bytes")):
+        return None
+    return record
+
+
+class ResourceSampler:
+    """Periodically account CPU, RSS and process count for each agent's process tree.
+
+    One /proc scan per tick serves every tracked agent. An agent's tree is
+    everything below its root plus everything in its session, so processes
+    it orphaned are still found after it exits. CPU totals only ever grow.
+    A root launched through rusage_wrapper.py is left out of the totals.
+    Does nothing on platforms without /proc.
+    """
+
+    def __init__(self, interval: float = RESOURCE_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.enabled = os.path.isdir("/proc") and hasattr(os, "sysconf")
+        self._roots: dict[str, int] = {}
+        self._wrapped: set[str] = set()
+        self._usage: dict[str, TreeUsage] = {}
+        self._task: asyncio.Future | None = None
+
+    def track(self, name: str, pid: int, wrapped: bool = False) -> None:
+        if not self.enabled:
+            return
+        self._roots[name] = pid
+        if wrapped:
+            self._wrapped.add(name)
+        self._usage[name] = TreeUsage()
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def sample(self) -> None:
+        """Sample now, e.g. right after an agent exits and before its session is stopped."""
+        if self._roots:
+            await self._sample()
+
+    async def untrack(self, name: str) -> TreeUsage:
+        """Stop tracking *name* after a last sample of any descendants still alive."""
+        if name in self._roots:
+            await self._sample()
+            del self._roots[name]
+            self._wrapped.discard(name)
+        return self._usage.pop(name, TreeUsage())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if self._roots:
+                await self._sample()
+
+    async def _sample(self) -> None:
+        table = await asyncio.get_running_loop().run_in_executor(None, read_proc_table)
+        children: dict[int, list[int]] = {}
+        sessions: dict[int, list[int]] = {}
+        for pid, (ppid, _, _, _, sid) in table.items():
+            children.setdefault(ppid, []).append(pid)
+            sessions.setdefault(sid, []).append(pid)
+        for name, root in list(self._roots.items()):
+            usage = self._usage[name]
+            below = self._descendants([root] if root in table else [], table, children)
+            # Once the agent itself has exited, follow descendants we already know about
+            # and whatever is left in its session
+            tree = self._descendants(below + [p for p in usage.pids if p in table] + sessions.get(root, []),
+                                     table, children)
+            if name in self._wrapped:
+                tree = [p for p in tree if p != root]
+                below = [p for p in below if p != root]
+            if not tree:
+                continue
+            for pid in set(tree) - set(below):
+                usage.orphan_cpu[pid] = (table[pid][1], table[pid][2])
+            usage.pids.update(tree)
+            usage.cpu_user_seconds = max(usage.cpu_user_seconds, sum(table[p][1] for p in tree))
+            usage.cpu_system_seconds = max(usage.cpu_system_seconds, sum(table[p][2] for p in tree))
+            usage.peak_rss_bytes = max(usage.peak_rss_bytes, sum(table[p][3] for p in tree))
+
+    @staticmethod
+    def _descendants(roots: list[int], table: dict, children: dict[int, list[int]]) -> list[int]:
+        """*roots* and everything below them that is still in *table*."""
+        stack, found = list(roots), []
+        seen: set[int] = set()
+        while stack:
+            pid = stack.pop()
+            if pid in table and pid not in seen:
+                seen.add(pid)
+                found.append(pid)
+                stack.extend(children.get(pid, ()))
+        return found
+
+
+def children_rusage() -> dict[str, float] | None:
+    """Return CPU and max RSS of all reaped child processes so far (POSIX only)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "cpu_user_seconds": usage.ru_utime,
+        "cpu_system_seconds": usage.ru_stime,
+        "max_rss_bytes": usage.ru_maxrss * scale,
+    }
+
+
 def which(cmd: str) -> str | None:
     """Return the full path to *cmd* (resolves .cmd/.bat on Windows)."""
     return shutil.which(cmd)
 
 
-def create_worktree(repo_root: str, name: str, ts: str) -> str | None:
-    """Create a detached worktree. Returns path or None on failure."""
-    wt_path = os.path.join(repo_root, ".claude", "worktrees", f"verify-{name}-{ts}")
-    try:
+def resolve_commit(repo_root: str, rev: str = "HEAD") -> str | None:
+    """Return the full hash of *rev*, or None if it cannot be resolved."""
+    result = subprocess.run(
+        ["git", "rev-parse", "--verify", f"{rev}^{{commit}}"],
+        cwd=repo_root, capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def sparse_dirs_for(changed_files: list[str], include: list[str]) -> list[str]:
+    """Return the cone-mode directory set covering *changed_files* plus *include*.
+
+    Cone mode always checks out root-level files and the files directly inside
+    every ancestor of a listed directory, so build manifests next to or above
+    the changed code come along without being listed.
+    """
+    dirs: list[str] = []
+    for path in list(include) + [os.path.dirname(p.replace("\\", "/")) for p in changed_files]:
+        path = path.strip().strip("/")
+        if path and path not in dirs:
+            dirs.append(path)
+    return dirs
+
+
+def read_changed_files(path: str) -> list[str]:
+    """Read changed paths, one per line (plain or ``git diff --name-status`` output)."""
+    changed = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            # --name-status lines are "M\tpath" or "R100\told\tnew"; keep the last field
+            changed.append(line.split("\t")[-1].strip())
+    return changed
+
+
+def apply_sparse_checkout(wt_path: str, sparse_dirs: list[str] | None) -> subprocess.CompletedProcess | None:
+    """Limit *wt_path* to *sparse_dirs* in cone mode, or restore a full checkout for None.
+
+    Returns None when the worktree already has the requested (full) shape.
+    """
+    if sparse_dirs is None:
+        current = subprocess.run(
+            ["git", "config", "--get", "core.sparseCheckout"],
+            cwd=wt_path, capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
+        )
+        if current.stdout.strip() != "true":
+            return None
+        args = ["sparse-checkout", "disable"]
+    else:
+        args = ["sparse-checkout", "set", "--cone", "--"] + sparse_dirs
+    return subprocess.run(["git"] + args, cwd=wt_path, capture_output=True, **_SUBPROCESS_TEXT_KWARGS)
+
+
+def add_worktree(repo_root: str, wt_path: str, commit: str, sparse_dirs: list[str] | None = None) -> None:
+    """Run ``git worktree add`` for a detached *commit*, sparse when *sparse_dirs* is given.
+
+    Raises CalledProcessError on failure.
+    """
+    run_kwargs: dict[str, Any] = dict(capture_output=True, check=True, **_SUBPROCESS_TEXT_KWARGS)
+    # Register without checking out (narrowing the cone when sparse), then populate
+    with _worktree_admin_lock:
         subprocess.run(
-            ["git", "worktree", "add", wt_path, "HEAD", "--detach"],
-            cwd=repo_root, capture_output=True, check=True, **_SUBPROCESS_TEXT_KWARGS,
+            ["git", "worktree", "add", "--no-checkout", wt_path, commit, "--detach"], cwd=repo_root, **run_kwargs,
         )
+    sparse = apply_sparse_checkout(wt_path, sparse_dirs)
+    if sparse is not None and sparse.returncode != 0:
+        raise subprocess.CalledProcessError(sparse.returncode, sparse.args, sparse.stdout, sparse.stderr)
+    subprocess.run(["git", "checkout", "--quiet", "--detach", commit], cwd=wt_path, **run_kwargs)
+
+
+def create_worktree(
+    repo_root: str, name: str, ts: str, commit: str = "HEAD", sparse_dirs: list[str] | None = None,
+) -> str | None:
+    """Create a detached worktree at *commit*. Returns path or None on failure."""
+    wt_path = os.path.join(repo_root, ".claude", "worktrees", f"verify-{name}-{ts}")
+    try:
+        add_worktree(repo_root, wt_path, commit, sparse_dirs)
         return wt_path
     except subprocess.CalledProcessError as e:
         print(f"[orchestrator] Failed to create worktree for {name}: {e.stderr}", file=sys.stderr)
@@ -84,62 +552,462 @@ def create_worktree(repo_root: str, name: str, ts: str) -> str | None:
 def remove_worktree(repo_root: str, wt_path: str) -> None:
     """Force-remove a worktree."""
     try:
-        subprocess.run(
-            ["git", "worktree", "remove", wt_path, "--force"],
-            cwd=repo_root, capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
-        )
+        with _worktree_admin_lock:
+            subprocess.run(
+                ["git", "worktree", "remove", wt_path, "--force"],
+                cwd=repo_root, capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
+            )
     except Exception:
         pass
 
 
-def collect_git_result(wt_path: str) -> dict[str, Any]:
-    """Collect commit and diff info from a worktree."""
-    info: dict[str, Any] = {"files_changed": 0, "committed": False, "commit_hash": ""}
+def _try_lock(path: str) -> Any | None:
+    """Take a non-blocking exclusive lock on *path*; returns the open handle or None.
 
-    # Check for uncommitted changes
-    diff_stat = subprocess.run(
-        ["git", "diff", "HEAD", "--stat"], cwd=wt_path,
-        capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
-    )
-    uncommitted = bool(diff_stat.stdout.strip())
+    The OS drops the lock when the holder exits, so a crashed run never leaves a
+    slot locked forever.
+    """
+    f = open(path, "a+")
+    try:
+        if IS_WINDOWS:
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
 
-    # Check for new commits (compare with detached HEAD parent)
-    log_result = subprocess.run(
-        ["git", "log", "--oneline", "-1", "--format=%H"], cwd=wt_path,
-        capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
-    )
-    current_hash = log_result.stdout.strip()
 
-    # Count changed files (committed or uncommitted)
-    if uncommitted:
-        stat_cmd = ["git", "diff", "HEAD", "--name-only"]
-    else:
-        stat_cmd = ["git", "diff", "HEAD~1", "--name-only"]
+def _unlock(handle: Any) -> None:
+    """Release a lock taken by _try_lock()."""
+    try:
+        if IS_WINDOWS:
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    finally:
+        handle.close()
+
+
+class WorktreePool:
+    """Persistent verification worktrees reused across runs.
+
+    Slots live at ``.claude/worktrees/verify-pool-{i}``, each guarded by a
+    ``.lock`` file so concurrent runs never share one. The lock lasts only as
+    long as the orchestrator; a ``.lease`` file naming the run then keeps the
+    slot out of other runs until the supervisor has reviewed and applied its
+    results and calls release_leases(). Acquiring a slot resets
+    it to the target commit with ``reset --hard`` + ``clean``, which costs about
+    as much as the diff since the slot's last use instead of a full checkout.
+    Ignored files (dependency and build caches) survive between runs on purpose.
+    """
+
+    def __init__(self, repo_root: str, size: int) -> None:
+        self.repo_root = repo_root
+        self.size = size
+        self.base_dir = os.path.join(repo_root, ".claude", "worktrees")
+
+    def _slot_path(self, index: int) -> str:
+        return os.path.join(self.base_dir, f"verify-pool-{index}")
+
+    def _git(self, args: list[str], cwd: str) -> subprocess.CompletedProcess:
+        return subprocess.run(["git"] + args, cwd=cwd, capture_output=True, **_SUBPROCESS_TEXT_KWARGS)
+
+    def _discard(self, wt_path: str) -> None:
+        """Remove a slot's worktree, including a broken or unregistered directory."""
+        remove_worktree(self.repo_root, wt_path)
+        shutil.rmtree(wt_path, ignore_errors=True)
+        with _worktree_admin_lock:
+            self._git(["worktree", "prune"], self.repo_root)
+
+    def _prepare(self, wt_path: str, commit: str, sparse_dirs: list[str] | None) -> bool:
+        """Reset an existing slot to *commit*, or create it. Returns success."""
+        if os.path.exists(os.path.join(wt_path, ".git")):
+            # Reshape the checkout first so reset only touches files inside the cone
+            step = apply_sparse_checkout(wt_path, sparse_dirs)
+            if step is None or step.returncode == 0:
+                step = self._git(["reset", "--hard", "--quiet", commit], wt_path)
+            if step.returncode == 0:
+                step = self._git(["clean", "-ffdq"], wt_path)
+                if step.returncode == 0:
+                    return True
+            print(f"[orchestrator] Pool slot {wt_path} is unusable, recreating: "
+                  f"{(step.stderr or '').strip()}", file=sys.stderr)
+        if os.path.exists(wt_path):
+            self._discard(wt_path)
+        else:
+            with _worktree_admin_lock:
+                self._git(["worktree", "prune"], self.repo_root)
+        try:
+            add_worktree(self.repo_root, wt_path, commit, sparse_dirs)
+        except subprocess.CalledProcessError as e:
+            print(f"[orchestrator] Failed to create pool slot {wt_path}: {e.stderr}", file=sys.stderr)
+            return False
+        return True
 
-    stat_result = subprocess.run(stat_cmd, cwd=wt_path, capture_output=True, **_SUBPROCESS_TEXT_KWARGS)
-    changed_files = [f for f in stat_result.stdout.strip().split("\n") if f]
-    info["files_changed"] = len(changed_files)
+    @staticmethod
+    def _leased(wt_path: str) -> bool:
+        """True if another run still holds a lease on the slot."""
+        try:
+            age = time.time() - os.path.getmtime(wt_path + ".lease")
+        except OSError:
+            return False
+        return age < POOL_LEASE_MAX_AGE
 
-    # Check if agent committed
-    parent_check = subprocess.run(
-        ["git", "rev-list", "--count", "HEAD"], cwd=wt_path,
-        capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
+    def acquire(self, commit: str, run: str, sparse_dirs: list[str] | None = None) -> tuple[str, Any] | None:
+        """Lock and lease a free slot for *run* and reset it to *commit*.
+
+        Returns (path, lock) or None if the pool is full.
+        """
+        os.makedirs(self.base_dir, exist_ok=True)
+        for index in range(self.size):
+            wt_path = self._slot_path(index)
+            lock = _try_lock(wt_path + ".lock")
+            if lock is None:
+                continue
+            if self._leased(wt_path):
+                _unlock(lock)
+                continue
+            if self._prepare(wt_path, commit, sparse_dirs):
+                Path(wt_path + ".lease").write_text(run + "\n", encoding="utf-8")
+                return wt_path, lock
+            _unlock(lock)
+        return None
+
+    def release_leases(self, run: str) -> int:
+        """Drop the leases *run* holds, returning its slots to the pool. Returns how many."""
+        released = 0
+        # Every slot, including those beyond self.size left by a larger --pool-size
+        for lease in Path(self.base_dir).glob("verify-pool-*.lease"):
+            try:
+                if lease.read_text(encoding="utf-8").strip() != run:
+                    continue
+                lease.unlink()
+            except OSError:
+                continue
+            released += 1
+        return released
+
+    def release(self, lock: Any) -> None:
+        """Hand a slot back to the pool (its worktree is kept for the next run)."""
+        _unlock(lock)
+
+    def trim(self) -> None:
+        """Evict slots beyond the configured size that no run is using."""
+        if not os.path.isdir(self.base_dir):
+            return
+        prefix = "verify-pool-"
+        for entry in os.listdir(self.base_dir):
+            suffix = entry[len(prefix):]
+            if not entry.startswith(prefix) or not suffix.isdigit() or int(suffix) < self.size:
+                continue
+            wt_path = os.path.join(self.base_dir, entry)
+            lock = _try_lock(wt_path + ".lock")
+            if lock is None:
+                continue
+            if self._leased(wt_path):
+                _unlock(lock)
+                continue
+            print(f"[orchestrator] Evicting pool slot {entry} (pool size {self.size})")
+            self._discard(wt_path)
+            _unlock(lock)
+            for suffix in (".lock", ".lease"):
+                try:
+                    os.remove(wt_path + suffix)
+                except OSError:
+                    pass
+
+
+def tree_fingerprint(repo_root: str, commit: str, ignore: list[str] | None = None) -> str | None:
+    """Identify the content of *commit*: its tree hash, or with *ignore* patterns a
+    hash of ``ls-tree -r`` minus the matching paths (so e.g. doc-only edits keep it)."""
+    if not ignore:
+        proc = subprocess.run(["git", "rev-parse", f"{commit}^{{tree}}"],
+                              cwd=repo_root, capture_output=True, **_SUBPROCESS_TEXT_KWARGS)
+        return proc.stdout.strip() if proc.returncode == 0 else None
+    proc = subprocess.run(["git", "ls-tree", "-r", "-z", "--full-tree", commit],
+                          cwd=repo_root, capture_output=True, **_SUBPROCESS_TEXT_KWARGS)
+    if proc.returncode != 0:
+        return None
+    digest = hashlib.sha256()
+    for entry in proc.stdout.split("\0"):
+        path = entry.split("\t", 1)[-1]
+        if entry and not any(fnmatch.fnmatch(path, pattern) for pattern in ignore):
+            digest.update(entry.encode("utf-8", "surrogateescape") + b"\0")
+    return "filtered-" + digest.hexdigest()
+
+
+class ReportCache:
+    """Reports of earlier successful runs in ``.claude/verify-cache/{key}.json``.
+
+    A run is stored only if no agent failed or timed out. Stored reports hold
+    each agent's ``patch`` and ``verify_files`` (see collect_artifacts()) in
+    place of its worktree and log, which cleanup and later runs remove.
+    Entries older than *max_age_days* are ignored and evicted; after each store
+    the oldest entries are evicted until the directory fits in *max_bytes*.
+    """
+
+    def __init__(self, repo_root: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 max_age_days: float = DEFAULT_CACHE_MAX_AGE_DAYS) -> None:
+        self.cache_dir = os.path.join(repo_root, ".claude", "verify-cache")
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+
+    @staticmethod
+    def key(tree: str, prompt: str, agents: list[AgentConfig], timeout: int,
+            sparse_dirs: list[str] | None, quorum: int) -> str:
+        """Cache key: everything that decides what the agents verify and how."""
+        material = {
+            "version": CACHE_VERSION,
+            "tree": tree,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "agents": [[a.name, a.cli_cmd, a.timeout or timeout, a.prompt_via] for a in agents],
+            "sparse_dirs": sparse_dirs,
+            "quorum": quorum,
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """The cached report for *key*, or None. A malformed entry is a miss and is removed."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except OSError:
+            return None
+        except ValueError:
+            entry = None
+        try:
+            created = float(entry["created"])
+            report = entry["report"]
+            if not (isinstance(report, dict) and isinstance(report["agents"], dict)
+                    and isinstance(report["success"], bool) and isinstance(report.get("base_commit", ""), str)):
+                raise TypeError("not a verification report")
+        except (KeyError, TypeError, ValueError):
+            print(f"[orchestrator] Ignoring malformed cache entry {path}", file=sys.stderr)
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+        age = time.time() - created
+        if self.max_age > 0 and age > self.max_age:
+            return None
+        report["cache"] = {"hit": True, "key": key, "created": created, "age_seconds": round(age)}
+        return report
+
+    def put(self, key: str, report: dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self._path(key) + f".{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"created": time.time(), "report": report}, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"[orchestrator] Could not write verification cache: {e}", file=sys.stderr)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then the oldest ones until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort(reverse=True)
+        total = 0
+        now = time.time()
+        for mtime, size, path in entries:
+            expired = self.max_age > 0 and now - mtime > self.max_age
+            if expired or (self.max_bytes > 0 and total + size > self.max_bytes):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            else:
+                total += size
+
+
+def _count_lines(path: str) -> int | None:
+    """Count lines the way ``git diff --numstat`` would; None for binary files."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if b"\0" in data[:8000]:
+        return None
+    return data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+
+
+def collect_git_result(wt_path: str, base: str) -> dict[str, Any]:
+    """Collect commit and diff info from a worktree, measured against *base*.
+
+    Uses two git calls regardless of how many commits the agent made:
+    ``status --porcelain=v2`` for the current HEAD and untracked files, and
+    ``diff --numstat <base>`` for per-file line counts across both committed
+    and uncommitted changes.
+    """
+    info: dict[str, Any] = {"files_changed": 0, "committed": False, "commit_hash": "", "file_stats": []}
+
+    status = subprocess.run(
+        ["git", "status", "--porcelain=v2", "--branch", "--untracked-files=all", "-z"],
+        cwd=wt_path, capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
     )
-    original_head_file = os.path.join(wt_path, ".git")
-    # If there's a new commit beyond the detached HEAD
-    diff_check = subprocess.run(
-        ["git", "diff", "--name-only", "HEAD~1"], cwd=wt_path,
-        capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
+    head = ""
+    untracked: list[str] = []
+    for entry in status.stdout.split("\0"):
+        if entry.startswith("# branch.oid "):
+            head = entry[len("# branch.oid "):].strip()
+        elif entry.startswith("? "):
+            untracked.append(entry[2:])
+
+    numstat = subprocess.run(
+        ["git", "diff", "--numstat", "--no-renames", "-z", base],
+        cwd=wt_path, capture_output=True, **_SUBPROCESS_TEXT_KWARGS,
     )
-    if diff_check.returncode == 0 and diff_check.stdout.strip():
+    file_stats: list[dict[str, Any]] = []
+    for entry in numstat.stdout.split("\0"):
+        parts = entry.split("\t", 2)
+        if len(parts) != 3:
+            continue
+        added, deleted, path = parts
+        file_stats.append({
+            "path": path,
+            "added": int(added) if added.isdigit() else None,  # "-" for binary files
+            "deleted": int(deleted) if deleted.isdigit() else None,
+        })
+    for path in untracked:
+        file_stats.append({"path": path, "added": _count_lines(os.path.join(wt_path, path)), "deleted": 0})
+
+    info["file_stats"] = file_stats
+    info["files_changed"] = len(file_stats)
+    if head and head != base and head != "(initial)":
         info["committed"] = True
-        info["commit_hash"] = current_hash
+        info["commit_hash"] = head
 
     return info
 
 
-def launch_agent(agent: AgentConfig, prompt: str, wt_path: str) -> subprocess.Popen | None:
-    """Launch a CLI agent as a subprocess in its worktree."""
+def collect_artifacts(wt_path: str, base: str) -> dict[str, Any]:
+    """Capture what reviewing an agent needs from its worktree, for a cached report.
+
+    ``patch`` is a binary ``git diff`` from *base* covering commits, uncommitted
+    edits and untracked files; ``verify_files`` maps each changed ``_verify_*``
+    file to its text. Untracked files are staged into a copy of the worktree's
+    index, so the worktree itself is left untouched.
+    """
+    artifacts: dict[str, Any] = {"patch": "", "verify_files": {}}
+    index = subprocess.run(["git", "rev-parse", "--git-path", "index"],
+                           cwd=wt_path, capture_output=True, **_SUBPROCESS_TEXT_KWARGS)
+    index_path = os.path.join(wt_path, index.stdout.strip())
+    fd, tmp_index = tempfile.mkstemp(prefix="verify-index-")
+    os.close(fd)
+    try:
+        if index.returncode == 0 and os.path.isfile(index_path):
+            shutil.copyfile(index_path, tmp_index)  # Keeps the stat cache: add -A rehashes only changes
+        else:
+            os.remove(tmp_index)
+        env = {**os.environ, "GIT_INDEX_FILE": tmp_index}
+
+        def git(args: list[str]) -> subprocess.CompletedProcess:
+            return subprocess.run(["git"] + args, cwd=wt_path, env=env, capture_output=True,
+                                  **_SUBPROCESS_TEXT_KWARGS)
+
+        if git(["add", "-A"]).returncode != 0:
+            return artifacts
+        artifacts["patch"] = git(["diff", "--cached", "--binary", "--no-renames", base]).stdout
+        names = git(["diff", "--cached", "--name-only", "--no-renames", "-z", "--diff-filter=d", base]).stdout
+        for path in names.split("\0"):
+            if os.path.basename(path).startswith("_verify_"):
+                try:
+                    artifacts["verify_files"][path] = Path(wt_path, path).read_text(encoding="utf-8",
+                                                                                   errors="replace")
+                except OSError:
+                    pass
+    finally:
+        try:
+            os.remove(tmp_index)
+        except OSError:
+            pass
+    return artifacts
+
+
+def cacheable_report(report: dict[str, Any], agents: list[AgentConfig], base: str) -> dict[str, Any]:
+    """Copy of *report* for the cache: artifacts inlined, run-local paths dropped."""
+    stored = json.loads(json.dumps(report))
+    for agent in agents:
+        entry = stored["agents"].get(agent.name)
+        if entry is None:
+            continue
+        entry["log_file"] = None
+        if agent.worktree_dir:
+            entry.update(collect_artifacts(agent.worktree_dir, base))
+    stored["worktree_paths"] = []
+    return stored
+
+
+def agent_log_path(repo_root: str, name: str, ts: str) -> str:
+    """Return the on-disk output log path for an agent (outside its worktree)."""
+    log_dir = os.path.join(repo_root, ".claude", "verify-logs")
+    os.makedirs(log_dir, exist_ok=True)
+    return os.path.join(log_dir, f"verify-{name}-{ts}.log")
+
+
+def agent_prompt_path(repo_root: str, name: str, ts: str) -> str:
+    """Return the prompt file path for an agent's stdin/file transport (outside its worktree)."""
+    prompt_dir = os.path.join(repo_root, ".claude", "verify-prompts")
+    os.makedirs(prompt_dir, exist_ok=True)
+    return os.path.join(prompt_dir, f"verify-{name}-{ts}.md")
+
+
+def prompt_transport(agent: AgentConfig, prompt: str) -> str:
+    """Resolve *agent*'s prompt_via, choosing for "auto" by the prompt's encoded size."""
+    if agent.prompt_via != "auto":
+        return agent.prompt_via
+    return "arg" if len(prompt.encode("utf-8")) <= ARG_PROMPT_LIMIT else "file"
+
+
+def write_prompt_file(path: str, prompt: str) -> None:
+    # Readable only by the user: the prompt may quote code and diffs
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+        f.write(prompt)
+
+
+def remove_prompt_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+async def launch_agent(
+    agent: AgentConfig, prompt: str, wt_path: str, log_path: str, prompt_path: str,
+    rusage_path: str | None = None,
+) -> tuple[asyncio.subprocess.Process, OutputDrain] | None:
+    """Launch a CLI agent as a subprocess in its worktree, draining output to *log_path*.
+
+    The prompt goes in as the agent's transport says: as the last argument,
+    or written to *prompt_path* and fed on stdin or referenced by path.
+    With *rusage_path*, the agent runs under rusage_wrapper.py, which writes
+    its exit rusage there.
+    """
     cmd_name = agent.cli_cmd[0]
     resolved = which(cmd_name)
     if not resolved:
@@ -150,129 +1018,458 @@ def launch_agent(agent: AgentConfig, prompt: str, wt_path: str) -> subprocess.Po
     # Prevent Claude Code nesting detection for child processes
     env.pop("CLAUDECODE", None)
 
+    transport = prompt_transport(agent, prompt)
+    args = list(agent.cli_cmd[1:])
+    stdin = None
+    if transport == "arg":
+        args.append(prompt)
+    else:
+        try:
+            write_prompt_file(prompt_path, prompt)
+            if transport == "stdin":
+                stdin = open(prompt_path, "rb")
+        except OSError as e:
+            print(f"[orchestrator] Cannot write the prompt file for {agent.name}: {e}", file=sys.stderr)
+            return None
+        if transport == "file":
+            if any(PROMPT_FILE_PLACEHOLDER in a for a in args):
+                args = [a.replace(PROMPT_FILE_PLACEHOLDER, prompt_path) for a in args]
+            else:
+                args.append(POINTER_PROMPT.format(path=prompt_path))
+
     # Use the fully-resolved path so Windows can execute .cmd/.bat wrappers
-    cmd = [resolved] + agent.cli_cmd[1:] + [prompt]
-    print(f"[orchestrator] Launching {agent.name}: {' '.join(agent.cli_cmd[:3])}... in {wt_path}")
+    cmd = [resolved] + args
+    if rusage_path is not None:
+        cmd = [sys.executable, RUSAGE_WRAPPER, rusage_path] + cmd
+    print(f"[orchestrator] Launching {agent.name}: {' '.join(agent.cli_cmd[:3])}... in {wt_path} "
+          f"(prompt via {transport})")
+
+    # Output goes through our own pipe rather than asyncio's: before Python 3.12,
+    # Process.wait() also waits for its pipes to close, so a lingering grandchild
+    # holding stdout would hide the agent's exit.
+    read_fd, write_fd = os.pipe()
     try:
-        proc = subprocess.Popen(
-            cmd, cwd=wt_path, env=env,
-            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-            **_SUBPROCESS_TEXT_KWARGS,
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, cwd=wt_path, env=env, stdin=stdin, stdout=write_fd, stderr=subprocess.STDOUT, **popen_kwargs(),
         )
-        return proc
     except Exception as e:
+        os.close(read_fd)
         print(f"[orchestrator] Failed to launch {agent.name}: {e}", file=sys.stderr)
         return None
+    finally:
+        os.close(write_fd)
+        if stdin is not None:
+            stdin.close()
+    return proc, OutputDrain(os.fdopen(read_fd, "rb"), log_path)
 
 
-def run_agents(
+async def stop_process(proc: asyncio.subprocess.Process, grace: float = TERM_GRACE, wrapped: bool = False) -> int:
+    """Terminate *proc* and everything left in its session, killing what outlives *grace* seconds.
+
+    Returns how many processes besides *proc* itself were stopped (and, if
+    *proc* is rusage_wrapper.py, besides the agent it runs).
+    """
+    # The wrapper exits as soon as its agent does, so a live wrapper means a live agent
+    agent_running = wrapped and proc.returncode is None
+    reaped = await asyncio.get_running_loop().run_in_executor(None, stop_group, proc.pid, grace)
+    if agent_running:
+        reaped = max(0, reaped - 1)
+    if proc.returncode is None:
+        await proc.wait()
+    return reaped
+
+
+@dataclass
+class RunContext:
+    """State shared by every agent task in one orchestration run."""
+    repo_root: str
+    timestamp: str
+    base: str
+    prompt: str
+    timeout: int
+    limiter: WeightedLimiter
+    sampler: ResourceSampler
+    pool: WorktreePool | None = None
+    # Pool slots taken by this run; held until every agent is done so a queued
+    # agent never resets a slot whose results have not been collected
+    slot_locks: list[Any] = field(default_factory=list)
+    sparse_dirs: list[str] | None = None
+    launched: set[str] = field(default_factory=set)
+    # Set once --quorum is met (and its grace period over) to stop the remaining agents
+    cancelled: asyncio.Event = field(default_factory=asyncio.Event)
+    telemetry: Recorder | None = None
+
+    def phase(self, agent: str, phase: str, seconds: float | None, outcome: str | None = None) -> None:
+        if self.telemetry is not None:
+            self.telemetry.phase(agent, phase, seconds, outcome)
+
+
+def mark_cancelled(result: AgentResult) -> AgentResult:
+    result.status = "cancelled"
+    result.error = "quorum reached before the agent started"
+    return result
+
+
+async def supervise_agent(agent: AgentConfig, ctx: RunContext) -> AgentResult:
+    """Wait for a scheduler slot, then get a worktree for *agent*, run it, and collect results."""
+    result = AgentResult(name=agent.name)
+    started = time.monotonic()
+    if ctx.limiter.in_use + min(agent.weight, ctx.limiter.capacity) > ctx.limiter.capacity:
+        print(f"[orchestrator] {agent.name} queued ({ctx.limiter.in_use}/{ctx.limiter.capacity} slots in use)")
+    weight = await ctx.limiter.acquire(agent.weight)
+    ctx.phase(agent.name, "queue", time.monotonic() - started)
+    try:
+        if ctx.cancelled.is_set():
+            return mark_cancelled(result)
+        return await prepare_and_run(agent, result, ctx)
+    finally:
+        await ctx.limiter.release(weight)
+        ctx.phase(agent.name, "total", time.monotonic() - started, outcome=result.status)
+
+
+async def prepare_and_run(agent: AgentConfig, result: AgentResult, ctx: RunContext) -> AgentResult:
+    """Get a worktree for *agent* at the base commit and run it there."""
+    loop = asyncio.get_running_loop()
+
+    wt_path, lock = None, None
+    started = time.monotonic()
+    if ctx.pool is not None:
+        slot = await loop.run_in_executor(None, ctx.pool.acquire, ctx.base, ctx.timestamp, ctx.sparse_dirs)
+        if slot is not None:
+            wt_path, lock = slot
+            ctx.slot_locks.append(lock)
+        else:
+            print(f"[orchestrator] No free pool slot for {agent.name}, creating a fresh worktree")
+    if wt_path is None:
+        wt_path = await loop.run_in_executor(
+            None, create_worktree, ctx.repo_root, agent.name, ctx.timestamp, ctx.base, ctx.sparse_dirs,
+        )
+    if wt_path is None:
+        result.status = "failed"
+        result.error = "worktree creation failed"
+        return result
+    agent.worktree_dir = wt_path
+    ctx.phase(agent.name, "worktree", time.monotonic() - started, outcome="pool" if lock is not None else "fresh")
+
+    return await run_in_worktree(agent, result, ctx)
+
+
+async def run_in_worktree(agent: AgentConfig, result: AgentResult, ctx: RunContext) -> AgentResult:
+    """Launch *agent* in its prepared worktree, wait for exit or timeout, and collect results."""
+    loop = asyncio.get_running_loop()
+    wt_path = agent.worktree_dir
+    timeout = agent.timeout or ctx.timeout
+    if ctx.cancelled.is_set():
+        return mark_cancelled(result)
+
+    log_path = agent_log_path(ctx.repo_root, agent.name, ctx.timestamp)
+    prompt_path = agent_prompt_path(ctx.repo_root, agent.name, ctx.timestamp)
+    wrapped = not IS_WINDOWS and os.path.isfile(RUSAGE_WRAPPER)
+    rusage_path = os.path.splitext(log_path)[0] + ".rusage.json" if wrapped else None
+    launch_time = time.monotonic()
+    started = await launch_agent(agent, ctx.prompt, wt_path, log_path, prompt_path, rusage_path)
+    ctx.phase(agent.name, "launch", time.monotonic() - launch_time)
+    if started is None:
+        remove_prompt_file(prompt_path)
+        result.status = "failed"
+        result.error = f"{agent.cli_cmd[0]} could not be launched"
+        return result
+
+    proc, drain = started
+    ctx.launched.add(agent.name)
+    ctx.sampler.track(agent.name, proc.pid, wrapped=wrapped)
+    result.status = "running"
+    result.log_file = log_path
+    start_time = loop.time()
+    exited = asyncio.ensure_future(proc.wait())
+    cancelled = asyncio.ensure_future(ctx.cancelled.wait())
+    try:
+        done, _ = await asyncio.wait({exited, cancelled}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        run_seconds = loop.time() - start_time
+        # Before anything is stopped: catches whatever an agent that just exited left running
+        await ctx.sampler.sample()
+        result.duration_seconds = round(run_seconds, 1)
+        stop_time = time.monotonic()
+        if exited in done:
+            ret = exited.result()
+            result.status = "completed" if ret == 0 else "failed"
+            result.exit_code = ret
+            # Workers the agent left running (dev servers, test watchers) go with it
+            result.reaped_processes = await stop_process(proc, wrapped=wrapped)
+        elif cancelled in done:
+            print(f"[orchestrator] Quorum reached, stopping {agent.name}...")
+            result.reaped_processes = await stop_process(proc, wrapped=wrapped)
+            result.status = "cancelled"
+            result.error = "stopped after the quorum was reached"
+        else:
+            print(f"[orchestrator] {agent.name} timed out after {timeout}s, killing...")
+            result.reaped_processes = await stop_process(proc, wrapped=wrapped)
+            result.status = "timeout"
+            result.error = f"exceeded {timeout}s timeout"
+        ctx.phase(agent.name, "run", run_seconds, outcome=result.status)
+        ctx.phase(agent.name, "stop", time.monotonic() - stop_time)
+        if result.reaped_processes:
+            print(f"[orchestrator] {agent.name}: stopped {result.reaped_processes} leftover process(es)")
+    finally:
+        cancelled.cancel()
+        exited.cancel()
+        if proc.returncode is None:
+            stop_group(proc.pid, grace=0)
+        remove_prompt_file(prompt_path)
+
+    usage = await ctx.sampler.untrack(agent.name)
+    exit_usage = read_exit_rusage(rusage_path) if rusage_path else None
+    if exit_usage is not None:
+        usage.add_exit_rusage(exit_usage)
+    result.cpu_user_seconds = round(usage.cpu_user_seconds, 2)
+    result.cpu_system_seconds = round(usage.cpu_system_seconds, 2)
+    result.peak_rss_bytes = usage.peak_rss_bytes
+    result.process_count = len(usage.pids)
+
+    await loop.run_in_executor(None, drain.join, DRAIN_GRACE)
+    if result.status == "failed":
+        result.error = drain.tail()
+    if drain.first_output_at is not None:
+        ctx.phase(agent.name, "first_output", drain.first_output_at - launch_time)
+
+    # Collect git info (partial results too, for timed-out and cancelled agents)
+    git_time = time.monotonic()
+    git_info = await loop.run_in_executor(None, collect_git_result, wt_path, ctx.base)
+    ctx.phase(agent.name, "git_collect", time.monotonic() - git_time)
+    result.files_changed = git_info["files_changed"]
+    result.committed = git_info["committed"]
+    result.commit_hash = git_info["commit_hash"]
+    result.file_stats = git_info["file_stats"]
+    if result.status not in ("timeout", "cancelled"):
+        print(f"[orchestrator] {agent.name} finished: status={result.status}, "
+              f"exit={result.exit_code}, files={git_info['files_changed']}, "
+              f"duration={result.duration_seconds}s")
+    return result
+
+
+async def wait_for_quorum(tasks: list[asyncio.Task], quorum: int, grace: float, ctx: RunContext) -> None:
+    """Wait until *quorum* agents have completed, then give the rest *grace* seconds before cancelling them."""
+    pending = set(tasks)
+    completed = 0
+    while pending and completed < quorum:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        completed += sum(1 for t in done if t.exception() is None and t.result().status == "completed")
+    if not pending:
+        return
+    print(f"[orchestrator] Quorum of {quorum} reached; {len(pending)} agent(s) still running"
+          + (f", waiting up to {grace:g}s" if grace > 0 else ""))
+    if grace > 0:
+        _, pending = await asyncio.wait(pending, timeout=grace)
+    if pending:
+        ctx.cancelled.set()
+
+
+async def run_agents_async(
     repo_root: str,
     timestamp: str,
     prompt: str,
     timeout: int = 600,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    sparse_dirs: list[str] | None = None,
+    agents: list[AgentConfig] | None = None,
+    max_parallel: int = 0,
+    quorum: int = 0,
+    quorum_grace: float = 0.0,
+    cache: ReportCache | None = None,
+    cache_ignore: list[str] | None = None,
+    telemetry: bool = True,
 ) -> dict[str, Any]:
-    """Main orchestration: create worktrees, launch agents, wait, collect results."""
-    results: dict[str, AgentResult] = {}
-    processes: dict[str, tuple[subprocess.Popen, str, float]] = {}  # name -> (proc, wt_path, start_time)
-    worktree_paths: list[str] = []
-
-    # Create worktrees and launch agents
-    for agent in AGENTS:
-        result = AgentResult(name=agent.name)
-        wt_path = create_worktree(repo_root, agent.name, timestamp)
-        if wt_path is None:
-            result.status = "failed"
-            result.error = "worktree creation failed"
-            results[agent.name] = result
-            continue
+    """Run agents concurrently under the scheduler; each awaits its own exit, timeout and git collection."""
+    run_started = time.monotonic()
+    recorder = Recorder(os.path.join(repo_root, VERIFY_TELEMETRY_FILE), "verify", timestamp, enabled=telemetry)
+    agents = [replace(a) for a in (agents if agents is not None else AGENTS)]
+    # Pin every worktree (and every diff) to the same commit, even if HEAD moves mid-run
+    base = resolve_commit(repo_root)
+    if base is None:
+        print("[orchestrator] Cannot resolve HEAD — does the repository have any commits?", file=sys.stderr)
+        return {"agents": {}, "success": False}
 
-        worktree_paths.append(wt_path)
-        agent.worktree_dir = wt_path
+    cache_key = None
+    if cache is not None:
+        tree = tree_fingerprint(repo_root, base, cache_ignore)
+        if tree is not None:
+            cache_key = cache.key(tree, prompt, agents, timeout, sparse_dirs, quorum)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print(f"[orchestrator] Cache hit: same tree, prompt and agents as the run at "
+                      f"base {cached.get('base_commit', '?')[:12]} ({cached['cache']['age_seconds']}s ago)")
+                recorder.phase("*", "total", time.monotonic() - run_started, outcome="cache_hit")
+                recorder.flush()
+                return cached
 
-        proc = launch_agent(agent, prompt, wt_path)
-        if proc is None:
-            result.status = "failed"
-            result.error = f"{agent.cli_cmd[0]} not found in PATH"
-            results[agent.name] = result
-            continue
+    pool = None
+    if pool_size > 0:
+        pool = WorktreePool(repo_root, pool_size)
+        await asyncio.get_running_loop().run_in_executor(None, pool.trim)
 
-        result.status = "running"
-        results[agent.name] = result
-        processes[agent.name] = (proc, wt_path, time.time())
+    max_parallel = max_parallel if max_parallel > 0 else default_max_parallel()
+    ctx = RunContext(
+        repo_root=repo_root, timestamp=timestamp, base=base, prompt=prompt, timeout=timeout,
+        limiter=WeightedLimiter(max_parallel), sampler=ResourceSampler(), pool=pool, sparse_dirs=sparse_dirs,
+        telemetry=recorder,
+    )
+    if quorum > len(agents):
+        print(f"[orchestrator] --quorum {quorum} exceeds the {len(agents)} agents; waiting for all of them")
+        quorum = len(agents)
+    print(f"[orchestrator] Running {len(agents)} agents (max {max_parallel} in parallel, "
+          f"default timeout={timeout}s{f', quorum {quorum}' if quorum > 0 else ''})...")
+    rusage_before = children_rusage()
+    try:
+        tasks = [asyncio.ensure_future(supervise_agent(agent, ctx)) for agent in agents]
+        if quorum > 0:
+            await wait_for_quorum(tasks, quorum, quorum_grace, ctx)
+        agent_results = await asyncio.gather(*tasks)
+    finally:
+        for lock in ctx.slot_locks:
+            pool.release(lock)
+        await ctx.sampler.close()
+        recorder.flush()
+    rusage_after = children_rusage()
+    results = {r.name: r for r in agent_results}
+    worktree_paths = [a.worktree_dir for a in agents if a.worktree_dir]
 
-    if not processes:
+    if not ctx.launched:
         print("[orchestrator] No agents launched successfully", file=sys.stderr)
         # Clean up worktrees that were created but whose agents failed to launch
+        # (pool slots stay warm for the next run)
         for wt in worktree_paths:
-            remove_worktree(repo_root, wt)
+            if not os.path.basename(wt).startswith("verify-pool-"):
+                remove_worktree(repo_root, wt)
+        if pool is not None:
+            pool.release_leases(timestamp)
+        recorder.phase("*", "total", time.monotonic() - run_started, outcome="no_agents")
+        recorder.flush()
         return {"agents": {k: asdict(v) for k, v in results.items()}, "success": False}
 
-    # Poll until all done or timeout
-    print(f"[orchestrator] Waiting for {len(processes)} agents (timeout={timeout}s)...")
-    while processes:
-        for name in list(processes.keys()):
-            proc, wt_path, start_time = processes[name]
-            elapsed = time.time() - start_time
-
-            ret = proc.poll()
-            if ret is not None:
-                # Process finished
-                results[name].status = "completed" if ret == 0 else "failed"
-                results[name].exit_code = ret
-                results[name].duration_seconds = round(elapsed, 1)
-                if ret != 0:
-                    output = proc.stdout.read() if proc.stdout else ""
-                    results[name].error = output[-500:] if len(output) > 500 else output
-                # Collect git info
-                git_info = collect_git_result(wt_path)
-                results[name].files_changed = git_info["files_changed"]
-                results[name].committed = git_info["committed"]
-                results[name].commit_hash = git_info["commit_hash"]
-                del processes[name]
-                print(f"[orchestrator] {name} finished: status={results[name].status}, "
-                      f"exit={ret}, files={git_info['files_changed']}, "
-                      f"duration={results[name].duration_seconds}s")
-
-            elif elapsed > timeout:
-                # Timeout — kill
-                print(f"[orchestrator] {name} timed out after {timeout}s, killing...")
-                try:
-                    proc.terminate()
-                    proc.wait(timeout=10)
-                except Exception:
-                    proc.kill()
-                results[name].status = "timeout"
-                results[name].duration_seconds = round(elapsed, 1)
-                results[name].error = f"exceeded {timeout}s timeout"
-                # Still collect any partial results
-                git_info = collect_git_result(wt_path)
-                results[name].files_changed = git_info["files_changed"]
-                results[name].committed = git_info["committed"]
-                results[name].commit_hash = git_info["commit_hash"]
-                del processes[name]
-
-        if processes:
-            time.sleep(5)
-
     # Summary
     completed = sum(1 for r in results.values() if r.status == "completed")
     report = {
         "agents": {k: asdict(v) for k, v in results.items()},
         "completed_count": completed,
+        "cancelled_count": sum(1 for r in results.values() if r.status == "cancelled"),
         "total_count": len(results),
-        "success": completed > 0,
+        "quorum": quorum,
+        "success": completed >= max(quorum, 1),
+        "base_commit": base,
+        "sparse_dirs": sparse_dirs,
         "worktree_paths": worktree_paths,
     }
+    if rusage_before is not None and rusage_after is not None:
+        # Final rusage of every reaped child of this run (agents, their descendants, git)
+        report["children_rusage"] = {
+            "cpu_user_seconds": round(rusage_after["cpu_user_seconds"] - rusage_before["cpu_user_seconds"], 2),
+            "cpu_system_seconds": round(rusage_after["cpu_system_seconds"] - rusage_before["cpu_system_seconds"], 2),
+            "max_rss_bytes": rusage_after["max_rss_bytes"],
+        }
+    recorder.phase("*", "total", time.monotonic() - run_started, outcome="success" if report["success"] else "failed")
+    recorder.flush()
+    if cache_key is not None:
+        # Only clean runs: a failed or timed-out agent deserves a retry, not a replay.
+        # Cancelled agents (quorum met) are fine.
+        clean = all(r.status in ("completed", "cancelled") for r in results.values())
+        if report["success"] and clean:
+            stored = await asyncio.get_running_loop().run_in_executor(None, cacheable_report, report, agents, base)
+            cache.put(cache_key, stored)
+        report["cache"] = {"hit": False, "key": cache_key, "stored": report["success"] and clean}
     return report
 
 
+def run_agents(
+    repo_root: str,
+    timestamp: str,
+    prompt: str,
+    timeout: int = 600,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    sparse_dirs: list[str] | None = None,
+    agents: list[AgentConfig] | None = None,
+    max_parallel: int = 0,
+    quorum: int = 0,
+    quorum_grace: float = 0.0,
+    cache: ReportCache | None = None,
+    cache_ignore: list[str] | None = None,
+    telemetry: bool = True,
+) -> dict[str, Any]:
+    """Main orchestration: create worktrees, launch agents, wait, collect results.
+
+    With *sparse_dirs*, worktrees use cone-mode sparse-checkout limited to
+    those directories (plus root-level files). *agents* defaults to AGENTS;
+    *max_parallel* of 0 derives the limit from CPU count and free memory.
+    With *quorum* > 0 the run ends once that many agents have completed:
+    the others get *quorum_grace* seconds, then are stopped and reported as
+    ``cancelled``.
+    With a *cache*, the report of a run where no agent failed or timed out
+    is stored, with each agent's patch and _verify_* files, under the base
+    commit's tree (minus *cache_ignore* paths), prompt and agent set, and
+    returned without running anything when all of them match again.
+    With *telemetry*, per-agent phase timings (queue, worktree, launch,
+    first_output, run, stop, git_collect, total) are appended to
+    .claude/verify-telemetry.jsonl; `multi_agent_verify.py stats` summarizes them.
+    """
+    return asyncio.run(run_agents_async(
+        repo_root, timestamp, prompt, timeout, pool_size, sparse_dirs, agents, max_parallel,
+        quorum, quorum_grace, cache, cache_ignore, telemetry,
+    ))
+
+
+def release_main(argv: list[str]) -> None:
+    """Return the pool slots leased by one run (Phase V5 cleanup)."""
+    parser = argparse.ArgumentParser(prog="release", description="Release the pool slots leased by a run")
+    parser.add_argument("--repo-root", required=True, help="Path to the git repository root")
+    parser.add_argument("--timestamp", required=True, help="Timestamp of the run whose slots to release")
+    args = parser.parse_args(argv)
+    released = WorktreePool(os.path.abspath(args.repo_root), DEFAULT_POOL_SIZE).release_leases(args.timestamp)
+    print(f"[orchestrator] Released {released} pool slot(s) leased by {args.timestamp}")
+
+
 def main() -> None:
+    if sys.argv[1:2] == ["stats"]:
+        stats_main(sys.argv[2:], [VERIFY_TELEMETRY_FILE])
+        return
+    if sys.argv[1:2] == ["release"]:
+        release_main(sys.argv[2:])
+        return
     parser = argparse.ArgumentParser(description="Multi-agent verification orchestrator")
     parser.add_argument("--repo-root", required=True, help="Path to the git repository root")
     parser.add_argument("--timestamp", required=True, help="Timestamp for worktree naming (YYYYMMDD-HHMMSS)")
     parser.add_argument("--prompt-file", required=True, help="Path to the verification prompt file")
     parser.add_argument("--timeout", type=int, default=600, help="Per-agent timeout in seconds (default: 600)")
     parser.add_argument("--output", default=None, help="Path to write JSON report (default: stdout)")
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+                        help=f"Warm worktrees kept for reuse across runs; 0 creates a fresh worktree per agent "
+                             f"(default: {DEFAULT_POOL_SIZE})")
+    parser.add_argument("--agents-config", default=None,
+                        help="JSON file defining the agents to run (default: .claude/verify-agents.json "
+                             "in the repo if present, else opencode + codex)")
+    parser.add_argument("--max-parallel", type=int, default=0,
+                        help="Max agents running at once, by weight; extra agents queue "
+                             "(default: 0 = derive from CPU count and free memory)")
+    parser.add_argument("--quorum", type=int, default=0,
+                        help="Finish once this many agents have completed; the rest are cancelled "
+                             "(default: 0 = wait for every agent)")
+    parser.add_argument("--quorum-grace", type=float, default=0.0,
+                        help="Seconds the remaining agents may still finish after the quorum is met "
+                             "(default: 0 = cancel immediately)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always run the agents; neither read nor write .claude/verify-cache/")
+    parser.add_argument("--cache-max-bytes", type=int, default=DEFAULT_CACHE_MAX_BYTES,
+                        help=f"Evict the oldest cached reports beyond this total size (default: {DEFAULT_CACHE_MAX_BYTES})")
+    parser.add_argument("--cache-max-age-days", type=float, default=DEFAULT_CACHE_MAX_AGE_DAYS,
+                        help=f"Ignore and evict cached reports older than this (default: {DEFAULT_CACHE_MAX_AGE_DAYS})")
+    parser.add_argument("--cache-ignore", action="append", default=None, metavar="PATTERN",
+                        help="Path glob excluded from the cache key, e.g. 'docs/*' or '*.md' (repeatable)")
+    parser.add_argument("--no-telemetry", action="store_true",
+                        help="Do not append phase timings to .claude/verify-telemetry.jsonl")
+    parser.add_argument("--changed-files", default=None,
+                        help="File listing changed paths (one per line or git --name-status output); "
+                             "enables sparse-checkout worktrees limited to their directories")
+    parser.add_argument("--sparse-include", action="append", default=None, metavar="DIR",
+                        help="Extra directory to include in sparse worktrees (repeatable; "
+                             f"default: {', '.join(DEFAULT_SPARSE_INCLUDE)})")
     args = parser.parse_args()
 
     prompt_path = Path(args.prompt_file)
@@ -290,17 +1487,51 @@ def main() -> None:
         print(f"[orchestrator] Not a git repository: {repo_root}", file=sys.stderr)
         sys.exit(1)
 
+    agents_config = args.agents_config
+    if agents_config is None and os.path.isfile(os.path.join(repo_root, ".claude", "verify-agents.json")):
+        agents_config = os.path.join(repo_root, ".claude", "verify-agents.json")
+    agents = None
+    if agents_config:
+        try:
+            agents = load_agents(agents_config)
+        except ValueError as e:
+            print(f"[orchestrator] {e}", file=sys.stderr)
+            sys.exit(1)
+
+    sparse_dirs = None
+    if args.changed_files:
+        if not os.path.isfile(args.changed_files):
+            print(f"[orchestrator] Changed-files list not found: {args.changed_files}", file=sys.stderr)
+            sys.exit(1)
+        include = args.sparse_include if args.sparse_include is not None else DEFAULT_SPARSE_INCLUDE
+        sparse_dirs = sparse_dirs_for(read_changed_files(args.changed_files), include)
+
     print(f"[orchestrator] Starting multi-agent verification")
     print(f"  repo: {repo_root}")
     print(f"  timestamp: {args.timestamp}")
     print(f"  prompt: {len(prompt)} chars")
     print(f"  timeout: {args.timeout}s per agent")
+    if args.quorum > 0:
+        print(f"  quorum: {args.quorum} (grace {args.quorum_grace:g}s)")
+    if agents_config:
+        print(f"  agents: {agents_config}")
+    if sparse_dirs is not None:
+        print(f"  sparse: {', '.join(sparse_dirs) or '(root files only)'}")
 
     report = run_agents(
         repo_root=repo_root,
         timestamp=args.timestamp,
         prompt=prompt,
         timeout=args.timeout,
+        pool_size=args.pool_size,
+        sparse_dirs=sparse_dirs,
+        agents=agents,
+        max_parallel=args.max_parallel,
+        quorum=args.quorum,
+        quorum_grace=args.quorum_grace,
+        cache=None if args.no_cache else ReportCache(repo_root, args.cache_max_bytes, args.cache_max_age_days),
+        cache_ignore=args.cache_ignore,
+        telemetry=not args.no_telemetry,
     )
 
     report_json = json.dumps(report, indent=2, ensure_ascii=False)
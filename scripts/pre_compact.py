@@ -1,16 +1,20 @@
 ﻿#!/usr/bin/env python3
 """PreCompact hook: Snapshot .cc-claude-codex/status.md before context compact.
 
-Reads hook input from stdin (JSON) for cwd. Copies status.md to
-.cc-claude-codex/snapshots/YYYYMMDD-HHMMSS.md.
+Reads hook input from stdin (JSON) for cwd. Records status.md in the
+content-addressed snapshot store under .cc-claude-codex/snapshots/ (see
+snapshot_store.py), applies retention, and refreshes the cached status index
+so the hooks that follow the compact start from a warm sidecar.
 """
 
+import argparse
 import json
-import shutil
 import sys
-from datetime import datetime
 from pathlib import Path
 
+from snapshot_store import DEFAULT_KEEP_DAYS, DEFAULT_KEEP_LAST, SnapshotStore
+from status_index import load_index
+
 
 def get_cwd(hook_input: dict) -> Path:
     """Return cwd from hook input, falling back to current directory."""
@@ -21,6 +25,13 @@ def get_cwd(hook_input: dict) -> Path:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="PreCompact hook: snapshot status.md")
+    parser.add_argument("--keep-last", type=int, default=DEFAULT_KEEP_LAST,
+                        help=f"Snapshots always kept (default: {DEFAULT_KEEP_LAST})")
+    parser.add_argument("--keep-days", type=int, default=DEFAULT_KEEP_DAYS,
+                        help=f"Days for which the last snapshot of each day is kept (default: {DEFAULT_KEEP_DAYS})")
+    args = parser.parse_args()
+
     try:
         hook_input = json.loads(sys.stdin.read())
     except (json.JSONDecodeError, EOFError):
@@ -29,17 +40,22 @@ def main():
     cwd = get_cwd(hook_input)
     status_file = cwd / ".cc-claude-codex" / "status.md"
 
-    if not status_file.exists():
+    index = load_index(status_file)
+    if index is None:
         sys.exit(0)
 
     snapshots_dir = cwd / ".cc-claude-codex" / "snapshots"
     snapshots_dir.mkdir(parents=True, exist_ok=True)
+    store = SnapshotStore(snapshots_dir)
 
-    ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-    dest = snapshots_dir / f"{ts}.md"
-    shutil.copy2(status_file, dest)
+    # Hash the bytes actually stored: status.md may have changed since load_index
+    entry, created = store.put(status_file.read_bytes())
+    store.prune(args.keep_last, args.keep_days)
 
-    print(f"Status snapshot saved: {dest}", file=sys.stderr)
+    open_count = sum(1 for task in index["subtasks"] if not task["checked"])
+    state = "saved" if created else "unchanged since"
+    print(f"Status snapshot {state} {entry['ts']} ({entry['sha1'][:12]}, {open_count} open subtasks)",
+          file=sys.stderr)
 
 
 if __name__ == "__main__":
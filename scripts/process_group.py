@@ -0,0 +1,141 @@
+﻿#!/usr/bin/env python3
+"""Launch agents in their own session and stop everything they started.
+
+Codex and OpenCode spawn test runners, dev servers and language servers that
+outlive the agent when only the agent itself is signalled. Agents started
+with popen_kwargs() lead a new session (a new process group on Windows), so
+stop_group() can find and signal every process they left behind:
+
+  POSIX    SIGTERM to the process group and to every session member, then
+           SIGKILL to whatever is still alive after the grace period.
+           Session members are listed from /proc on Linux, which also
+           catches descendants that moved to a process group of their own.
+  Windows  taskkill /T /F on the agent's process tree.
+
+The number of leftover processes is counted on Linux only (0 elsewhere).
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+
+IS_WINDOWS = sys.platform == "win32"
+
+# Seconds between SIGTERM and SIGKILL
+TERM_GRACE = 10.0
+# How long to wait for SIGKILLed processes to disappear
+KILL_WAIT = 2.0
+POLL_INTERVAL = 0.1
+
+
+def popen_kwargs() -> dict:
+    """Popen / create_subprocess_exec arguments that start the child in a new session."""
+    if IS_WINDOWS:
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _proc_stats():
+    """Yield (pid, fields after "(comm)") for every process in /proc."""
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                data = f.read().decode("ascii", errors="replace")
+        except OSError:
+            continue  # Exited while we were scanning
+        # Fields after "(comm)", which may itself contain spaces and parentheses:
+        # state, ppid, pgrp, session, ..., utime (11), stime, cutime, cstime
+        yield int(entry), data[data.rindex(")") + 2:].split()
+
+
+def session_members(sid: int):
+    """Live (non-zombie) pids in session *sid*, or None where /proc is unavailable."""
+    if not os.path.isdir("/proc"):
+        return None
+    members = set()
+    for pid, fields in _proc_stats():
+        try:
+            if fields[0] != "Z" and int(fields[3]) == sid:
+                members.add(pid)
+        except (IndexError, ValueError):
+            continue
+    return members
+
+
+def session_cpu(sid: int):
+    """pid -> CPU seconds (including reaped children) for session *sid*, or None without /proc."""
+    if not os.path.isdir("/proc") or not hasattr(os, "sysconf"):
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    usage = {}
+    for pid, fields in _proc_stats():
+        try:
+            if int(fields[3]) == sid:
+                usage[pid] = sum(int(fields[i]) for i in (11, 12, 13, 14)) / ticks
+        except (IndexError, ValueError):
+            continue
+    return usage
+
+
+def _group_alive(pgid: int) -> bool:
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists, but not ours to signal
+    return True
+
+
+def _signal(pgid: int, members, sig: int):
+    try:
+        os.killpg(pgid, sig)
+    except OSError:
+        pass
+    for pid in members or ():
+        try:
+            os.kill(pid, sig)
+        except OSError:
+            pass
+
+
+def stop_group(pid: int, grace: float = TERM_GRACE, poll=None) -> int:
+    """Stop the session led by *pid*: SIGTERM everything, SIGKILL what outlives *grace*.
+
+    Works whether or not *pid* itself has already exited. *poll* is called
+    while waiting so a caller holding the Popen object can reap the leader
+    (e.g. ``proc.poll``). Returns how many processes other than *pid* were
+    found in the session.
+    """
+    if IS_WINDOWS:
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(pid)], capture_output=True)
+        return 0
+
+    def alive():
+        if poll is not None:
+            poll()
+        members = session_members(pid)
+        if members is None:
+            return _group_alive(pid), None
+        leftovers.update(members - {pid})
+        return bool(members), members
+
+    leftovers = set()
+    running, members = alive()
+    if not running:
+        return 0
+    for sig, wait in ((signal.SIGTERM, grace), (signal.SIGKILL, KILL_WAIT)):
+        _signal(pid, members, sig)
+        deadline = time.monotonic() + wait
+        while True:
+            running, members = alive()
+            if not running or time.monotonic() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+        if not running:
+            break
+    return len(leftovers)
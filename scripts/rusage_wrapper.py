@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Run a command and record its resource usage when it exits (POSIX).
+
+Usage: python rusage_wrapper.py <output.json> <command> [args...]
+
+multi_agent_verify.py launches each agent through this wrapper so the agent's
+final rusage (CPU time and max RSS of the agent and every descendant it
+reaped) is known even if it exits between two /proc samples. The command
+inherits stdin, stdout, stderr and the session. When it ends, the wrapper
+writes {"pid", "cpu_user_seconds", "cpu_system_seconds", "max_rss_bytes"} to
+<output.json> and exits with the command's status, re-raising the signal that
+killed it. SIGTERM is forwarded instead of obeyed, so the wrapper outlives the
+command and still records how it ended.
+"""
+
+import json
+import os
+import resource
+import signal
+import subprocess
+import sys
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__.strip(), file=sys.stderr)
+        sys.exit(2)
+    out_path, cmd = sys.argv[1], sys.argv[2:]
+
+    child = None
+
+    def forward(signum, frame):
+        if child is not None:
+            try:
+                child.send_signal(signum)
+            except OSError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward)
+    try:
+        child = subprocess.Popen(cmd)
+    except OSError as e:
+        print(f"rusage_wrapper: cannot run {cmd[0]}: {e}", file=sys.stderr)
+        sys.exit(127)
+    returncode = child.wait()
+
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    record = {
+        "pid": child.pid,
+        "cpu_user_seconds": usage.ru_utime,
+        "cpu_system_seconds": usage.ru_stime,
+        "max_rss_bytes": usage.ru_maxrss * scale,
+    }
+    try:
+        tmp = f"{out_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp, out_path)
+    except OSError:
+        pass
+
+    if returncode < 0:
+        signal.signal(-returncode, signal.SIG_DFL)
+        os.kill(os.getpid(), -returncode)
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,31 @@
 
 Reads hook input from stdin (JSON) for cwd. Outputs JSON with
 additionalContext containing the current status.md content.
+
+The file is injected section by section within a byte budget (--budget,
+default 12000; or --budget-tokens). Only the current batch and the checkbox
+line of every unchecked subtask are always included, so only those can push
+the result past the budget; everything else (section headings with counts,
+requirement titles and blocks, details of open subtasks in later batches) is
+filled in by priority, with older Verification Results and Codex Execution
+Log rows dropped first.
 """
 
+import argparse
+import hashlib
 import json
+import re
 import sys
 from pathlib import Path
 
+from status_index import load_index, load_view, save_view
+
+DEFAULT_BUDGET = 12000
+BYTES_PER_TOKEN = 4
+
+CHECKBOX_RE = re.compile(r"^- \[([ xX])\] ")
+COVERS_RE = re.compile(r"Requirement:\s*([^>\n]+?)\s*(?:>|$)")
+
 
 def get_cwd(hook_input: dict) -> Path:
     """Return cwd from hook input, falling back to current directory."""
@@ -18,7 +37,252 @@ def get_cwd(hook_input: dict) -> Path:
     return Path(".")
 
 
+def size(lines: list) -> int:
+    """UTF-8 size of *lines* joined by newlines."""
+    return sum(len(line.encode("utf-8")) + 1 for line in lines)
+
+
+def split_blocks(lines: list, prefix: str) -> tuple:
+    """Split *lines* at lines starting with *prefix*; returns (intro, [block, ...])."""
+    intro, blocks = [], []
+    for line in lines:
+        if line.startswith(prefix):
+            blocks.append([line])
+        elif blocks:
+            blocks[-1].append(line)
+        else:
+            intro.append(line)
+    return intro, blocks
+
+
+def split_items(lines: list) -> tuple:
+    """Split a batch body into (other lines, [(checked, item lines), ...])."""
+    other, items = [], []
+    for line in lines:
+        m = CHECKBOX_RE.match(line)
+        if m:
+            items.append((m.group(1) != " ", [line]))
+        elif items and (line.startswith((" ", "\t")) and line.strip()):
+            items[-1][1].append(line)
+        elif line.strip():
+            other.append(line)
+    return other, items
+
+
+class Section:
+    """A "## " section that can be rendered at increasing levels of detail."""
+
+    def __init__(self, heading: str, lines: list):
+        self.heading = heading
+        self.lines = lines
+        self.levels = [self.summary()]
+        self.level = 0
+
+    def summary(self) -> list:
+        count = sum(1 for line in self.lines if line.strip())
+        if not count:
+            return [self.heading]
+        return [self.heading, f"({count} lines omitted to fit the context budget)"]
+
+    def full(self) -> list:
+        return [self.heading] + self.lines
+
+    def render(self) -> list:
+        return self.levels[self.level]
+
+    def upgrade_cost(self):
+        """Extra bytes for the next level, or None if already at full detail."""
+        if self.level + 1 >= len(self.levels):
+            return None
+        return size(self.levels[self.level + 1]) - size(self.render())
+
+
+class GenericSection(Section):
+    def __init__(self, heading: str, lines: list):
+        super().__init__(heading, lines)
+        self.levels.append(self.full())
+
+
+class TableSection(Section):
+    """A log-style table: the header is always kept, rows are added newest-first."""
+
+    def __init__(self, heading: str, lines: list):
+        super().__init__(heading, lines)
+        table = [line for line in lines if line.startswith("|")]
+        notes = [line for line in lines if line.strip() and not line.startswith("|")]
+        header, rows = table[:2], table[2:]
+        self.levels = []
+        for kept in range(len(rows) + 1):
+            shown = rows[len(rows) - kept:]
+            omitted = len(rows) - kept
+            level = [heading] + header + shown
+            if omitted:
+                level.append(f"({omitted} older rows omitted to fit the context budget)")
+            self.levels.append(level + notes)
+
+
+class SubtasksSection(Section):
+    """The current batch and the checkbox lines of all unchecked subtasks are mandatory.
+
+    Later batches' open subtasks gain their detail lines (Covers, Acceptance,
+    Scope) one batch per upgrade, nearest batch first. Each run of finished
+    batches collapses into a single count line.
+    """
+
+    def __init__(self, heading: str, lines: list):
+        super().__init__(heading, lines)
+        intro, batches = split_blocks(lines, "### ")
+        # Per batch: (brief, detailed) renderings
+        renderings = []
+        self.covers = set()
+        current_found = False
+        for batch in batches:
+            other, items = split_items(batch[1:])
+            unchecked = [item for checked, item in items if not checked]
+            if unchecked and not current_found:
+                # Current batch: first batch with open work, shown in full
+                current_found = True
+                renderings.append((batch, batch))
+                for _, item in items:
+                    self._collect_covers(item)
+            elif unchecked:
+                note = []
+                if len(items) > len(unchecked):
+                    note = [f"({len(items) - len(unchecked)} completed subtasks omitted)"]
+                brief = [batch[0]] + [item[0] for item in unchecked] + note
+                detailed = [batch[0]] + other + [line for item in unchecked for line in item] + note
+                renderings.append((brief, detailed))
+                for item in unchecked:
+                    self._collect_covers(item)
+            elif renderings and renderings[-1][0] is None:
+                done_batches, done_items = renderings[-1][1]
+                renderings[-1] = (None, (done_batches + 1, done_items + len(items)))
+            else:
+                renderings.append((None, (1, len(items))))
+        # Finished runs: (None, (batches, subtasks)) -> one shared line
+        for i, (brief, detailed) in enumerate(renderings):
+            if brief is None:
+                done = [f"({detailed[0]} batches, {detailed[1]} subtasks done)"]
+                renderings[i] = (done, done)
+        expandable = [i for i, (brief, detailed) in enumerate(renderings) if brief is not detailed]
+        self.detail_steps = len(expandable)
+        self.levels = []
+        for shown in range(len(expandable) + 1):
+            level = [heading]
+            for i, (brief, detailed) in enumerate(renderings):
+                level.extend(detailed if i in expandable[:shown] else brief)
+            self.levels.append(level)
+        self.levels.append(self.full())
+
+    def _collect_covers(self, item: list):
+        for line in item:
+            if "Covers:" in line:
+                self.covers.update(name.strip() for name in COVERS_RE.findall(line))
+
+
+class RequirementsSection(Section):
+    """A count; then titles and full blocks of what open subtasks cover; then all titles; then everything."""
+
+    def __init__(self, heading: str, lines: list, covers: set):
+        super().__init__(heading, lines)
+        intro, blocks = split_blocks(lines, "### Requirement:")
+        if not blocks:
+            self.levels.append(self.full())
+            return
+        covered = [block for block in blocks if block[0][len("### Requirement:"):].strip() in covers]
+        others = len(blocks) - len(covered)
+        note = [f"({others} other requirements omitted to fit the context budget)"] if others else []
+        self.levels = [
+            [heading, f"({len(blocks)} requirements omitted to fit the context budget)"],
+            [heading] + [block[0] for block in covered] + note,
+            [heading] + [line for block in covered for line in block] + note,
+            [heading] + [line for block in blocks for line in (block if block in covered else [block[0]])],
+            self.full(),
+        ]
+
+
+def parse_sections(content: str) -> tuple:
+    """Split status.md into (header lines, [(heading, body lines), ...])."""
+    # Template guidance lives in HTML comments and is never worth injecting
+    content = re.sub(r"<!--.*?-->", "", content, flags=re.DOTALL)
+    content = re.sub(r"\n{3,}", "\n\n", content)
+    header, blocks = split_blocks(content.splitlines(), "## ")
+    sections = []
+    for block in blocks:
+        body = block[1:]
+        while body and not body[-1].strip():
+            body.pop()
+        sections.append((block[0], body))
+    return header, sections
+
+
+def condense(content: str, budget: int) -> tuple:
+    """Render status.md within *budget* bytes. Returns (text, condensed?)."""
+    if len(content.encode("utf-8")) <= budget:
+        return content, False
+
+    header, raw_sections = parse_sections(content)
+    # Subtasks first: open subtasks decide which requirements are shown in full
+    subtasks = None
+    for heading, body in raw_sections:
+        if heading[3:].strip() == "Subtasks" and subtasks is None:
+            subtasks = SubtasksSection(heading, body)
+    covers = subtasks.covers if subtasks else set()
+
+    sections, by_name = [], {}
+    for heading, body in raw_sections:
+        name = heading[3:].strip()
+        if name == "Subtasks" and subtasks is not None and name not in by_name:
+            section = subtasks
+        elif name == "Subtasks":
+            section = SubtasksSection(heading, body)
+        elif name == "Requirements":
+            section = RequirementsSection(heading, body, covers)
+        elif name in ("Verification Results", "Codex Execution Log"):
+            section = TableSection(heading, body)
+        else:
+            section = GenericSection(heading, body)
+        sections.append(section)
+        by_name.setdefault(name, section)
+
+    # Fill the remaining budget by priority: (section, max upgrades; None = until full).
+    # Table sections upgrade one row at a time, newest rows first.
+    priority = [
+        ("Requirements", 2), ("Subtasks", subtasks.detail_steps if subtasks else 0),
+        ("Requirement Spec", 1), ("Known Issues", 1),
+        ("Verification Results", 10), ("Codex Execution Log", 5), ("Technical Decisions", 1),
+        ("Subtasks", None), ("Requirements", None),
+        ("Verification Results", None), ("Codex Execution Log", None),
+    ]
+    priority += [(name, 1) for name in by_name if name not in dict(priority)]
+    # Each section is followed by a blank line
+    used = size(header) + sum(size(s.render()) + 1 for s in sections)
+    for name, steps in priority:
+        section = by_name.get(name)
+        while section is not None and steps != 0:
+            cost = section.upgrade_cost()
+            if cost is None or used + cost > budget:
+                break
+            section.level += 1
+            used += cost
+            steps = None if steps is None else steps - 1
+
+    lines = list(header)
+    for section in sections:
+        lines.extend(section.render())
+        lines.append("")
+    return "\n".join(lines).rstrip() + "\n", True
+
+
 def main():
+    parser = argparse.ArgumentParser(description="SessionStart hook: inject status.md")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET,
+                        help=f"Max bytes of status.md to inject (default: {DEFAULT_BUDGET})")
+    parser.add_argument("--budget-tokens", type=int, default=0,
+                        help=f"Budget in tokens instead (approx. {BYTES_PER_TOKEN} bytes per token)")
+    args = parser.parse_args()
+    budget = args.budget_tokens * BYTES_PER_TOKEN if args.budget_tokens > 0 else args.budget
+
     try:
         hook_input = json.loads(sys.stdin.read())
     except (json.JSONDecodeError, EOFError):
@@ -27,19 +291,40 @@ def main():
     cwd = get_cwd(hook_input)
     status_file = cwd / ".cc-claude-codex" / "status.md"
 
-    if not status_file.exists():
+    index = load_index(status_file)
+    if index is None:
         sys.exit(0)
 
+    # The condensed view only changes with status.md, so it is cached per budget
+    view_key = f"inject:{budget}"
+    view = load_view(status_file, index, view_key)
+    if view is not None:
+        print(json.dumps({"additionalContext": view}))
+        return
+
+    raw = status_file.read_bytes()
     # Use utf-8-sig to tolerate BOM-prefixed UTF-8 files on Windows.
-    content = status_file.read_text(encoding="utf-8-sig")
+    content = raw.decode("utf-8-sig")
+    content, condensed = condense(content, budget)
+
+    intro = "Below is the current content of .cc-claude-codex/status.md. Continue from this state:\n\n"
+    if condensed:
+        intro = (
+            "Below is a condensed view of .cc-claude-codex/status.md (current batch in full, every open "
+            "subtask listed; other sections trimmed to fit). Read the file for anything omitted. "
+            "Continue from this state:\n\n"
+        )
 
     output = {
         "additionalContext": (
             "## CC Claude Codex Project Status (Auto-injected)\n"
-            "Below is the current content of .cc-claude-codex/status.md. Continue from this state:\n\n"
+            f"{intro}"
             f"{content}"
         )
     }
+    # Skip caching if status.md was edited after the index was loaded
+    if hashlib.sha1(raw).hexdigest() == index["sha1"]:
+        save_view(status_file, index, view_key, output["additionalContext"])
 
     # Keep stdout ASCII-safe so GBK consoles do not crash on print().
     print(json.dumps(output))
@@ -1,10 +1,27 @@
 ﻿#!/usr/bin/env python3
 """CC Claude Codex Skill v2 — Cross-platform installer.
 
-Usage: python setup.py
+Usage: python setup.py [--hook-daemon] [--check]
+
+Installs by manifest: source files are hashed and only added or changed files
+are copied; files dropped from the source are removed. When anything changed,
+the new skill directory is assembled next to the installed one and swapped in
+at once, so a hook never runs against a half-installed skill. Each skill
+directory records what was installed in .install-manifest.json; files not
+listed there are left in place.
+
+--hook-daemon registers hook_client.py instead of the hook scripts, so events
+are served by the long-lived hook_daemon.py (Unix only; falls back to running
+the scripts in-process when the daemon is unavailable).
+
+--check reports drift between the source and the installed skills and hooks
+without writing anything; exits 1 if anything differs.
 """
 
+import argparse
+import hashlib
 import json
+import os
 import platform
 import shutil
 import sys
@@ -21,58 +38,194 @@ def get_python_cmd() -> str:
     return "python" if platform.system() == "Windows" else "python3"
 
 
-def copy_skill(src: Path, dest: Path):
-    """Copy skill files to destination."""
-    if dest.exists():
-        shutil.rmtree(dest)
-    dest.mkdir(parents=True, exist_ok=True)
-
-    # Copy SKILL.md
-    shutil.copy2(src / "SKILL.md", dest / "SKILL.md")
-
-    # Copy scripts/
-    scripts_dest = dest / "scripts"
-    scripts_dest.mkdir(exist_ok=True)
-    for f in (src / "scripts").iterdir():
-        if f.is_file() and f.suffix == ".py":
-            shutil.copy2(f, scripts_dest / f.name)
-
-    # Copy references/
-    refs_dest = dest / "references"
-    refs_dest.mkdir(exist_ok=True)
-    for f in (src / "references").iterdir():
-        if f.is_file():
-            shutil.copy2(f, refs_dest / f.name)
-
-    # Copy code-acceptance/ skill (standalone acceptance skill)
-    acceptance_src = src / "code-acceptance"
-    if acceptance_src.exists():
-        acceptance_dest = dest.parent / "code-acceptance"
-        if acceptance_dest.exists():
-            shutil.rmtree(acceptance_dest)
-        acceptance_dest.mkdir(parents=True, exist_ok=True)
-        for f in acceptance_src.iterdir():
-            if f.is_file():
-                shutil.copy2(f, acceptance_dest / f.name)
-
-    # Copy multi-agent-verify/ skill
-    verify_src = src / "multi-agent-verify"
-    if verify_src.exists():
-        verify_dest = dest.parent / "multi-agent-verify"
-        if verify_dest.exists():
-            shutil.rmtree(verify_dest)
-        verify_dest.mkdir(parents=True, exist_ok=True)
-        for f in verify_src.iterdir():
-            if f.is_file():
-                shutil.copy2(f, verify_dest / f.name)
-
-
-def generate_hooks_config(skill_dir: Path) -> dict:
+# Files installed per skill directory: (subdirectory, glob) relative to the skill's source
+SKILL_LAYOUTS = {
+    "cc-claude-codex": (("", "SKILL.md"), ("scripts", "*.py"), ("references", "*")),
+    "code-acceptance": (("", "*"),),
+    "multi-agent-verify": (("", "*"),),
+}
+SKILL_SOURCES = {"cc-claude-codex": "", "code-acceptance": "code-acceptance", "multi-agent-verify": "multi-agent-verify"}
+MANIFEST_FILE = ".install-manifest.json"
+
+
+def collect_files(root: Path, layout: tuple) -> dict:
+    """Map relative install path -> file under *root* for every file matching *layout*."""
+    files = {}
+    for sub, pattern in layout:
+        directory = root / sub if sub else root
+        if not directory.is_dir():
+            continue
+        for f in sorted(directory.glob(pattern)):
+            if f.is_file() and f.name != MANIFEST_FILE:
+                files[f"{sub}/{f.name}" if sub else f.name] = f
+    return files
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def read_manifest(dest: Path):
+    """Installed path -> sha256 from the last install, or None if there is no manifest."""
+    try:
+        files = json.loads((dest / MANIFEST_FILE).read_text(encoding="utf-8")).get("files")
+    except (OSError, ValueError, AttributeError):
+        return None
+    return files if isinstance(files, dict) else None
+
+
+def write_manifest(dest: Path, files: dict):
+    tmp = dest / (MANIFEST_FILE + ".tmp")
+    tmp.write_text(json.dumps({"version": 1, "files": files}, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, dest / MANIFEST_FILE)
+
+
+def plan_sync(sources: dict, dest: Path, layout: tuple) -> dict:
+    """Compare source files with what is installed in *dest*.
+
+    Files the installer owns are those in the previous manifest (or, for an
+    install that predates manifests, those matching *layout*). Only those are
+    updated or removed; sync_skill() carries every other file in *dest* over
+    unchanged. Returns the wanted and installed hashes and the added /
+    modified / removed paths.
+    """
+    wanted = {rel: file_hash(path) for rel, path in sources.items()}
+    manifest = read_manifest(dest)
+    owned = set(manifest) if manifest is not None else set(collect_files(dest, layout))
+    installed = {}
+    for rel in owned | set(wanted):
+        path = dest / rel
+        if path.is_file():
+            installed[rel] = file_hash(path)
+    return {
+        "wanted": wanted,
+        "installed": installed,
+        "owned": sorted(owned),
+        "manifest_current": manifest == wanted,
+        "added": sorted(rel for rel in wanted if rel not in installed),
+        "modified": sorted(rel for rel in wanted if rel in installed and installed[rel] != wanted[rel]),
+        "removed": sorted(rel for rel in installed if rel not in wanted),
+    }
+
+
+def _exchange(a: Path, b: Path) -> bool:
+    """Atomically swap two directories (Linux renameat2, macOS renamex_np); False if unsupported."""
+    try:
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if sys.platform.startswith("linux") and hasattr(libc, "renameat2"):
+            at_fdcwd, rename_exchange = -100, 2
+            return libc.renameat2(at_fdcwd, os.fsencode(a), at_fdcwd, os.fsencode(b), rename_exchange) == 0
+        if sys.platform == "darwin" and hasattr(libc, "renamex_np"):
+            rename_swap = 2
+            return libc.renamex_np(os.fsencode(a), os.fsencode(b), rename_swap) == 0
+    except (OSError, AttributeError):
+        pass
+    return False
+
+
+def carry_over(dest: Path, staging: Path, skip: set):
+    """Hard-link (or copy) every file in *dest* whose relative path is not in *skip* into *staging*."""
+    for root, dirs, files in os.walk(dest):
+        for name in files + [d for d in dirs if os.path.islink(os.path.join(root, d))]:
+            path = Path(root) / name
+            rel = path.relative_to(dest).as_posix()
+            if rel in skip or rel == MANIFEST_FILE:
+                continue
+            target = staging / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if path.is_symlink():
+                os.symlink(os.readlink(path), target)
+                continue
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copy2(path, target)
+
+
+def swap_in(staging: Path, dest: Path):
+    """Replace *dest* with *staging* so readers see either the old or the new tree."""
+    if not dest.exists():
+        os.replace(staging, dest)
+        return
+    if _exchange(staging, dest):
+        shutil.rmtree(staging, ignore_errors=True)  # Now holds the previous tree
+        return
+    # No atomic exchange here: two renames, leaving *dest* missing only in between
+    old = dest.with_name(f".{dest.name}.old-{os.getpid()}")
+    os.replace(dest, old)
+    os.replace(staging, dest)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def sync_skill(sources: dict, dest: Path, plan: dict):
+    """Apply *plan*: build the new tree next to *dest* and swap it in.
+
+    Unchanged files are hard-linked from the current install rather than
+    copied, and files the installer does not own are carried over as they
+    are. Does nothing if every file is current; only refreshes the manifest
+    if just that is missing or stale.
+    """
+    if not (plan["added"] or plan["modified"] or plan["removed"]):
+        if not plan["manifest_current"]:
+            write_manifest(dest, plan["wanted"])
+        return
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    staging = dest.with_name(f".{dest.name}.new-{os.getpid()}")
+    if staging.exists():
+        shutil.rmtree(staging)
+    try:
+        for rel, digest in plan["wanted"].items():
+            target = staging / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if plan["installed"].get(rel) == digest:
+                try:
+                    os.link(dest / rel, target)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(sources[rel], target)
+        if dest.is_dir():
+            carry_over(dest, staging, set(plan["owned"]) | set(plan["wanted"]))
+        write_manifest(staging, plan["wanted"])
+        swap_in(staging, dest)
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def skill_plans(src: Path, skill_dir: Path) -> list:
+    """(name, sources, dest, plan) for the main skill and the bundled skills present in *src*."""
+    plans = []
+    for name, layout in SKILL_LAYOUTS.items():
+        source_root = src / SKILL_SOURCES[name] if SKILL_SOURCES[name] else src
+        if not source_root.is_dir():
+            continue
+        dest = skill_dir if name == "cc-claude-codex" else skill_dir.parent / name
+        sources = collect_files(source_root, layout)
+        plans.append((name, sources, dest, plan_sync(sources, dest, layout)))
+    return plans
+
+
+def describe(plan: dict) -> str:
+    if not (plan["added"] or plan["modified"] or plan["removed"]):
+        return "up to date"
+    unchanged = len(plan["wanted"]) - len(plan["added"]) - len(plan["modified"])
+    return (f"{len(plan['modified'])} updated, {len(plan['added'])} added, "
+            f"{len(plan['removed'])} removed ({unchanged} unchanged)")
+
+
+def generate_hooks_config(skill_dir: Path, use_daemon: bool = False) -> dict:
     """Generate hooks JSON config with platform-correct paths."""
     py = get_python_cmd()
     scripts = skill_dir / "scripts"
+    client_hooks = {"stop_check.py": "stop", "pre_compact.py": "pre-compact", "session_inject.py": "session-start"}
 
     def cmd(script_name: str) -> str:
+        if use_daemon:
+            return f'{py} "{(scripts / "hook_client.py").as_posix()}" {client_hooks[script_name]}'
         return f'{py} "{(scripts / script_name).as_posix()}"'
 
     return {
@@ -120,7 +273,7 @@ def generate_hooks_config(skill_dir: Path) -> dict:
 def merge_hooks(settings: dict, new_hooks: dict) -> dict:
     """Merge skill hooks into existing settings, replacing old skill entries."""
     existing = settings.get("hooks", {})
-    skill_scripts = ("stop_check.py", "pre_compact.py", "session_inject.py")
+    skill_scripts = ("stop_check.py", "pre_compact.py", "session_inject.py", "hook_client.py")
 
     def has_skill_hook(entry: dict) -> bool:
         """Return True if a hook entry contains any skill script command."""
@@ -149,17 +302,64 @@ def merge_hooks(settings: dict, new_hooks: dict) -> dict:
     return settings
 
 
+def merged_settings(skill_dir: Path, use_daemon: bool) -> tuple:
+    """Return (settings file, current JSON, JSON with the skill hooks merged in)."""
+    settings_file = Path.home() / ".claude" / "settings.json"
+    if settings_file.exists():
+        settings = json.loads(settings_file.read_text(encoding="utf-8"))
+    else:
+        settings = {}
+    old_settings = json.dumps(settings, indent=2, ensure_ascii=False)
+    settings = merge_hooks(settings, generate_hooks_config(skill_dir, use_daemon=use_daemon))
+    return settings_file, old_settings, json.dumps(settings, indent=2, ensure_ascii=False)
+
+
+def check(plans: list, skill_dir: Path, use_daemon: bool):
+    """Print per-skill and hooks drift; exit 1 if an install would change anything."""
+    drift = False
+    print(f"Checking CC Claude Codex skill in: {skill_dir}")
+    for name, _, _, plan in plans:
+        print(f"  {name}: {describe(plan)}")
+        for kind in ("added", "modified", "removed"):
+            for rel in plan[kind]:
+                print(f"    {kind}: {rel}")
+        drift = drift or bool(plan["added"] or plan["modified"] or plan["removed"])
+    _, old_settings, new_settings = merged_settings(skill_dir, use_daemon)
+    if old_settings == new_settings:
+        print("  hooks: up to date")
+    else:
+        print("  hooks: ~/.claude/settings.json needs the skill hooks merged in")
+        drift = True
+    sys.exit(1 if drift else 0)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Install the CC Claude Codex skill")
+    parser.add_argument("--hook-daemon", action="store_true",
+                        help="Route hooks through the persistent hook daemon (Unix only)")
+    parser.add_argument("--check", action="store_true",
+                        help="Report drift between source and installed files and hooks without writing; "
+                             "exit 1 if anything differs")
+    args = parser.parse_args()
+    if args.hook_daemon and platform.system() == "Windows":
+        print("Error: --hook-daemon requires Unix domain sockets and is not supported on Windows.", file=sys.stderr)
+        sys.exit(1)
+
     src = Path(__file__).resolve().parent.parent
     if not (src / "SKILL.md").exists():
         print("Error: Run this script from the cc-claude-codex skill directory.", file=sys.stderr)
         sys.exit(1)
 
     skill_dir = get_skill_dir()
+    plans = skill_plans(src, skill_dir)
+    if args.check:
+        check(plans, skill_dir, args.hook_daemon)
+        return
     print(f"Installing CC Claude Codex skill to: {skill_dir}")
 
-    copy_skill(src, skill_dir)
-    print("  Skill files copied.")
+    for name, sources, dest, plan in plans:
+        sync_skill(sources, dest, plan)
+        print(f"  {name}: {describe(plan)}.")
 
     for tool in ("codex", "opencode", "claude"):
         if shutil.which(tool):
@@ -168,18 +368,9 @@ def main():
             print(f"  Warning: '{tool}' not found in PATH.", file=sys.stderr)
 
     # Auto-merge hooks into settings.json
-    settings_file = Path.home() / ".claude" / "settings.json"
-    new_hooks = generate_hooks_config(skill_dir)
-
-    if settings_file.exists():
-        settings = json.loads(settings_file.read_text(encoding="utf-8"))
-    else:
+    settings_file, old_settings, new_settings = merged_settings(skill_dir, args.hook_daemon)
+    if not settings_file.exists():
         settings_file.parent.mkdir(parents=True, exist_ok=True)
-        settings = {}
-
-    old_settings = json.dumps(settings, indent=2, ensure_ascii=False)
-    settings = merge_hooks(settings, new_hooks)
-    new_settings = json.dumps(settings, indent=2, ensure_ascii=False)
 
     if old_settings == new_settings:
         print("  Hooks already configured, no changes needed.")
@@ -0,0 +1,179 @@
+﻿#!/usr/bin/env python3
+"""Content-addressed, compressed snapshot store for .cc-claude-codex/status.md.
+
+Layout under .cc-claude-codex/snapshots/:
+  objects/<sha1>.z   zlib-compressed status.md contents, one blob per distinct version
+  index.jsonl        append-only log of snapshots: {"ts", "sha1", "size"}
+
+Snapshotting unchanged content records nothing; each distinct edit adds
+one blob. Retention keeps the last N snapshots plus the newest snapshot of
+each of the last D days, and drops blobs no remaining entry references.
+
+Usage:
+  python snapshot_store.py list
+  python snapshot_store.py diff <id> [<id>]     # second id defaults to the current status.md
+  python snapshot_store.py restore <id> [--output PATH|-]
+
+<id> is a 1-based position from `list` (negative counts from the newest) or a
+hash prefix.
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import sys
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_KEEP_LAST = 20
+DEFAULT_KEEP_DAYS = 30
+
+
+class SnapshotStore:
+    def __init__(self, root: Path):
+        self.root = root
+        self.objects = root / "objects"
+        self.index_file = root / "index.jsonl"
+
+    def entries(self) -> list:
+        """Snapshot entries, oldest first; a torn last line is ignored."""
+        try:
+            lines = self.index_file.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries
+
+    def blob_path(self, sha1: str) -> Path:
+        return self.objects / f"{sha1}.z"
+
+    def put(self, data: bytes):
+        """Record a snapshot of *data*. Returns (entry, created?)."""
+        sha1 = hashlib.sha1(data).hexdigest()
+        entries = self.entries()
+        if entries and entries[-1]["sha1"] == sha1:
+            return entries[-1], False
+
+        blob = self.blob_path(sha1)
+        if not blob.exists():
+            self.objects.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_name(f"{blob.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(zlib.compress(data, 9))
+            os.replace(tmp, blob)
+
+        entry = {"ts": datetime.now().isoformat(timespec="seconds"), "sha1": sha1, "size": len(data)}
+        with self.index_file.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry, True
+
+    def get(self, sha1: str) -> bytes:
+        return zlib.decompress(self.blob_path(sha1).read_bytes())
+
+    def resolve(self, ref: str) -> dict:
+        """Find an entry by list position or hash prefix. Raises ValueError."""
+        entries = self.entries()
+        try:
+            pos = int(ref)
+        except ValueError:
+            matches = {e["sha1"] for e in entries if e["sha1"].startswith(ref)}
+            if len(matches) != 1:
+                raise ValueError(f"{'ambiguous' if matches else 'unknown'} snapshot: {ref}")
+            sha1 = matches.pop()
+            return [e for e in entries if e["sha1"] == sha1][-1]
+        if pos == 0 or abs(pos) > len(entries):
+            raise ValueError(f"no snapshot #{ref} ({len(entries)} recorded)")
+        return entries[pos - 1] if pos > 0 else entries[pos]
+
+    def prune(self, keep_last: int = DEFAULT_KEEP_LAST, keep_days: int = DEFAULT_KEEP_DAYS) -> int:
+        """Apply retention; returns the number of entries removed."""
+        entries = self.entries()
+        keep = set(range(max(0, len(entries) - keep_last), len(entries)))
+        cutoff = (datetime.now() - timedelta(days=keep_days)).date().isoformat()
+        newest_per_day = {}
+        for i, entry in enumerate(entries):
+            newest_per_day[entry["ts"][:10]] = i
+        keep.update(i for day, i in newest_per_day.items() if day >= cutoff)
+        if len(keep) == len(entries):
+            return 0
+
+        kept = [entry for i, entry in enumerate(entries) if i in keep]
+        tmp = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+        tmp.write_text("".join(json.dumps(e) + "\n" for e in kept), encoding="utf-8")
+        os.replace(tmp, self.index_file)
+
+        referenced = {e["sha1"] for e in kept}
+        for blob in self.objects.glob("*.z"):
+            if blob.stem not in referenced:
+                blob.unlink()
+        return len(entries) - len(kept)
+
+
+def _text(data: bytes) -> list:
+    return data.decode("utf-8-sig", errors="replace").splitlines(keepends=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and restore status.md snapshots")
+    parser.add_argument("--dir", default=".cc-claude-codex",
+                        help="CC Claude Codex state directory (default: .cc-claude-codex)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List snapshots, oldest first")
+    p_diff = sub.add_parser("diff", help="Unified diff between two snapshots")
+    p_diff.add_argument("a")
+    p_diff.add_argument("b", nargs="?", help="Defaults to the current status.md")
+    p_restore = sub.add_parser("restore", help="Restore a snapshot over status.md")
+    p_restore.add_argument("id")
+    p_restore.add_argument("--output", help="Write here instead of status.md ('-' for stdout)")
+    args = parser.parse_args()
+
+    state_dir = Path(args.dir)
+    status_file = state_dir / "status.md"
+    store = SnapshotStore(state_dir / "snapshots")
+
+    try:
+        if args.command == "list":
+            entries = store.entries()
+            if not entries:
+                print("No snapshots.")
+            for i, entry in enumerate(entries, 1):
+                print(f"{i:>4}  {entry['ts']}  {entry['sha1'][:12]}  {entry['size']:>8} B")
+
+        elif args.command == "diff":
+            a = store.resolve(args.a)
+            if args.b:
+                b = store.resolve(args.b)
+                b_data, b_name = store.get(b["sha1"]), f"{b['ts']} {b['sha1'][:12]}"
+            else:
+                b_data, b_name = status_file.read_bytes(), str(status_file)
+            sys.stdout.writelines(difflib.unified_diff(
+                _text(store.get(a["sha1"])), _text(b_data),
+                fromfile=f"{a['ts']} {a['sha1'][:12]}", tofile=b_name))
+
+        elif args.command == "restore":
+            entry = store.resolve(args.id)
+            data = store.get(entry["sha1"])
+            if args.output == "-":
+                sys.stdout.buffer.write(data)
+            elif args.output:
+                Path(args.output).write_bytes(data)
+            else:
+                # Snapshot the current file first so the restore can be undone
+                if status_file.exists():
+                    store.put(status_file.read_bytes())
+                status_file.write_bytes(data)
+                print(f"Restored {entry['ts']} ({entry['sha1'][:12]}) to {status_file}", file=sys.stderr)
+    except (ValueError, OSError, zlib.error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+﻿#!/usr/bin/env python3
+"""Shared, cached index of .cc-claude-codex/status.md for the hook scripts.
+
+The index (requirements, scenarios, subtasks with checked state, abort marker)
+is stored in a sidecar file, .cc-claude-codex/.status-index.json, keyed by the
+status file's mtime, size and content hash. Hooks get it with one stat() and
+one small JSON read while status.md is unchanged, and reparse only after it
+has been edited.
+
+Hooks may also cache derived renderings (e.g. the condensed SessionStart
+context) with save_view()/load_view(). Views live in a second sidecar,
+.cc-claude-codex/.status-views.json, keyed by the same content hash, so the
+hooks that only need the index never read them. A view is ignored once
+status.md changes.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+INDEX_VERSION = 2
+SIDECAR_NAME = ".status-index.json"
+VIEWS_NAME = ".status-views.json"
+ABORT_MARKER = "🛑"
+
+CHECKBOX_RE = re.compile(r"^- \[([ xX])\] (.+)$")
+
+# Indexes already loaded by this process; lets a long-lived process such as
+# hook_daemon.py skip even the sidecar read while status.md is unchanged.
+_loaded = {}
+# Same for views: sidecar path -> {"sha1", "views"}
+_loaded_views = {}
+
+
+def parse_status(content: str) -> dict:
+    """Compile status.md text into a structured index."""
+    requirements = []
+    subtasks = []
+    section = ""
+    batch = ""
+    for line in content.splitlines():
+        if line.startswith("## "):
+            section, batch = line[3:].strip(), ""
+        elif line.startswith("### Requirement:"):
+            requirements.append({"name": line[len("### Requirement:"):].strip(), "scenarios": []})
+        elif line.startswith("#### Scenario:") and requirements:
+            requirements[-1]["scenarios"].append(line[len("#### Scenario:"):].strip())
+        elif line.startswith("### "):
+            batch = line[4:].strip()
+        else:
+            m = CHECKBOX_RE.match(line)
+            if m:
+                subtasks.append({
+                    "text": m.group(2),
+                    "checked": m.group(1) != " ",
+                    "section": section,
+                    "batch": batch,
+                })
+    return {
+        "aborted": ABORT_MARKER in content,
+        "requirements": requirements,
+        "subtasks": subtasks,
+    }
+
+
+def unchecked(index: dict) -> list:
+    """Return the text of every unchecked "- [ ]" item."""
+    return [s["text"] for s in index["subtasks"] if not s["checked"]]
+
+
+def sidecar_path(status_file: Path) -> Path:
+    return status_file.parent / SIDECAR_NAME
+
+
+def views_path(status_file: Path) -> Path:
+    return status_file.parent / VIEWS_NAME
+
+
+def _write_sidecar(path: Path, data: dict):
+    """Write atomically so a concurrent hook never reads a half-written sidecar."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def load_index(status_file: Path):
+    """Return the index for *status_file*, or None if the file does not exist.
+
+    Served from the sidecar when mtime and size match; otherwise the file is
+    read and, if its hash differs too, reparsed and the sidecar rewritten.
+    """
+    try:
+        stat = status_file.stat()
+    except OSError:
+        return None
+
+    key = str(status_file.resolve())
+    index = _loaded.get(key)
+    if index and index["mtime_ns"] == stat.st_mtime_ns and index["size"] == stat.st_size:
+        return index
+
+    sidecar = sidecar_path(status_file)
+    try:
+        cached = json.loads(sidecar.read_text(encoding="utf-8"))
+        if cached.get("version") != INDEX_VERSION:
+            cached = None
+    except (OSError, ValueError):
+        cached = None
+
+    if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+        _loaded[key] = cached
+        return cached
+
+    raw = status_file.read_bytes()
+    digest = hashlib.sha1(raw).hexdigest()
+    if cached and cached["sha1"] == digest:
+        # Touched but not edited: refresh the key, keep the parse
+        index = cached
+    else:
+        # Use utf-8-sig to tolerate BOM-prefixed UTF-8 files on Windows.
+        index = parse_status(raw.decode("utf-8-sig", errors="replace"))
+        index.update(version=INDEX_VERSION, sha1=digest)
+    index.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+    _write_sidecar(sidecar, index)
+    _loaded[key] = index
+    return index
+
+
+def _load_views(status_file: Path, sha1: str) -> dict:
+    """Views cached for the status.md content hashing to *sha1* (possibly empty)."""
+    path = views_path(status_file)
+    key = str(path.resolve())
+    cached = _loaded_views.get(key)
+    if cached is None or cached["sha1"] != sha1:
+        try:
+            cached = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(cached.get("views"), dict):
+                cached = None
+        except (OSError, ValueError, AttributeError):
+            cached = None
+        if cached is None or cached.get("sha1") != sha1:
+            cached = {"sha1": sha1, "views": {}}
+        _loaded_views[key] = cached
+    return cached["views"]
+
+
+def load_view(status_file: Path, index: dict, key: str):
+    """Return the rendering cached under *key* for the current status.md, or None."""
+    return _load_views(status_file, index["sha1"]).get(key)
+
+
+def save_view(status_file: Path, index: dict, key: str, text: str):
+    """Cache a rendering derived from the current status.md under *key*."""
+    views = _load_views(status_file, index["sha1"])
+    views[key] = text
+    _write_sidecar(views_path(status_file), {"sha1": index["sha1"], "views": views})
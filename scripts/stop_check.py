@@ -2,14 +2,16 @@
 """Stop hook: Block if .cc-claude-codex/status.md has incomplete tasks.
 
 Reads hook input from stdin (JSON). Exits 2 + stderr message to block,
-exits 0 to allow.
+exits 0 to allow. Uses the cached status index, so a session that keeps
+retrying Stop does not reparse an unchanged status.md each time.
 """
 
 import json
-import re
 import sys
 from pathlib import Path
 
+from status_index import load_index, unchecked as unchecked_tasks
+
 
 def get_cwd(hook_input: dict) -> Path:
     """Return cwd from hook input, falling back to current directory."""
@@ -28,17 +30,15 @@ def main():
     cwd = get_cwd(hook_input)
     status_file = cwd / ".cc-claude-codex" / "status.md"
 
-    if not status_file.exists():
+    index = load_index(status_file)
+    if index is None:
         sys.exit(0)
 
-    # Use utf-8-sig to tolerate BOM-prefixed UTF-8 files on Windows.
-    content = status_file.read_text(encoding="utf-8-sig")
-
     # Allow stop if explicitly aborted
-    if "🛑" in content:
+    if index["aborted"]:
         sys.exit(0)
 
-    unchecked = re.findall(r"^- \[ \] (.+)$", content, re.MULTILINE)
+    unchecked = unchecked_tasks(index)
 
     if unchecked:
         msg = "CC Claude Codex: The following tasks are incomplete, cannot end session:\n"
@@ -0,0 +1,191 @@
+﻿#!/usr/bin/env python3
+"""Per-phase timing telemetry for cc-claude-codex.py and multi_agent_verify.py.
+
+Each wrapper appends one JSON line per measured phase to a local file
+(.cc-claude-codex/telemetry.jsonl and .claude/verify-telemetry.jsonl):
+
+  {"ts": "...", "tool": "verify", "run": "20260228-020854", "agent": "codex",
+   "phase": "first_output", "seconds": 3.21}
+
+Phase events may carry an "outcome" (exit reason or agent status). A file
+beyond TELEMETRY_MAX_BYTES is rotated to <file>.1, which stats still reads.
+
+Usage:
+  python telemetry.py stats [--file PATH]... [--since 7d] [--agent NAME] [--phase NAME] [--json]
+
+(also available as `cc-claude-codex.py stats` and `multi_agent_verify.py stats`
+with that tool's file as the default).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+CODEX_TELEMETRY_FILE = Path(".cc-claude-codex") / "telemetry.jsonl"
+VERIFY_TELEMETRY_FILE = Path(".claude") / "verify-telemetry.jsonl"
+TELEMETRY_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_WINDOW = "7d"
+PERCENTILES = (50, 95, 99)
+
+WINDOW_RE = re.compile(r"^(\d+(?:\.\d+)?)([mhdw])$")
+WINDOW_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+class Recorder:
+    """Collect phase events for one run and append them to *path* in a single write."""
+
+    def __init__(self, path, tool: str, run: str, enabled: bool = True):
+        self.path = Path(path)
+        self.tool = tool
+        self.run = run
+        self.enabled = enabled
+        self.events = []
+
+    def phase(self, agent: str, phase: str, seconds: float, outcome: str = None):
+        if not self.enabled or seconds is None:
+            return
+        event = {
+            "ts": datetime.now().astimezone().isoformat(timespec="seconds"),
+            "tool": self.tool, "run": self.run, "agent": agent, "phase": phase,
+            "seconds": round(seconds, 3),
+        }
+        if outcome is not None:
+            event["outcome"] = outcome
+        self.events.append(event)
+
+    def flush(self):
+        """Append the collected events; telemetry never fails the run it measures."""
+        if not self.events:
+            return
+        data = "".join(json.dumps(event) + "\n" for event in self.events)
+        self.events = []
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                if self.path.stat().st_size > TELEMETRY_MAX_BYTES:
+                    os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            except OSError:
+                pass
+            # One O_APPEND write per run keeps concurrent runs' lines whole
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+        except OSError as e:
+            print(f"Warning: could not write telemetry to {self.path}: {e}", file=sys.stderr)
+
+
+def parse_window(text: str) -> timedelta:
+    m = WINDOW_RE.match(text.strip())
+    if not m:
+        raise argparse.ArgumentTypeError(f"invalid window {text!r} (expected e.g. 30m, 24h, 7d, 2w)")
+    return timedelta(**{WINDOW_UNITS[m.group(2)]: float(m.group(1))})
+
+
+def read_events(paths: list, since: datetime = None) -> list:
+    """Events from *paths* (and their rotated .1 files) newer than *since*."""
+    events = []
+    for path in paths:
+        path = Path(path)
+        for candidate in (path.with_name(path.name + ".1"), path):
+            try:
+                lines = candidate.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                continue
+            for line in lines:
+                try:
+                    event = json.loads(line)
+                    ts = datetime.fromisoformat(event["ts"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if since is None or ts >= since:
+                    events.append(event)
+    return events
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(events: list) -> list:
+    """Group events by (tool, agent, phase) into count, percentiles, max and outcomes."""
+    groups = {}
+    for event in events:
+        key = (event.get("tool", "?"), event.get("agent", "?"), event.get("phase", "?"))
+        groups.setdefault(key, []).append(event)
+    rows = []
+    for (tool, agent, phase), group in sorted(groups.items()):
+        values = sorted(e["seconds"] for e in group if isinstance(e.get("seconds"), (int, float)))
+        if not values:
+            continue
+        row = {"tool": tool, "agent": agent, "phase": phase, "count": len(values)}
+        for pct in PERCENTILES:
+            row[f"p{pct}"] = percentile(values, pct)
+        row["max"] = values[-1]
+        outcomes = {}
+        for e in group:
+            if "outcome" in e:
+                outcomes[e["outcome"]] = outcomes.get(e["outcome"], 0) + 1
+        if outcomes:
+            row["outcomes"] = outcomes
+        rows.append(row)
+    return rows
+
+
+def format_rows(rows: list) -> str:
+    header = ["tool", "agent", "phase", "count"] + [f"p{p}" for p in PERCENTILES] + ["max"]
+    table = [header]
+    for row in rows:
+        table.append([row["tool"], row["agent"], row["phase"], str(row["count"])]
+                     + [f"{row[h]:.2f}s" for h in header[4:]])
+    widths = [max(len(r[i]) for r in table) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(w) if i < 3 else cell.rjust(w) for i, (cell, w) in enumerate(zip(r, widths)))
+             for r in table]
+    outcomes = [f"  {row['tool']}/{row['agent']} {row['phase']}: "
+                + ", ".join(f"{k} x{v}" for k, v in sorted(row["outcomes"].items(), key=lambda kv: -kv[1]))
+                for row in rows if row.get("outcomes")]
+    if outcomes:
+        lines += ["", "outcomes:"] + outcomes
+    return "\n".join(lines)
+
+
+def stats_main(argv: list, default_files: list):
+    parser = argparse.ArgumentParser(prog="stats", description="Per-phase timing percentiles from telemetry")
+    parser.add_argument("--file", action="append", default=None,
+                        help=f"Telemetry file to read (repeatable; default: {', '.join(map(str, default_files))})")
+    parser.add_argument("--since", type=parse_window, default=parse_window(DEFAULT_WINDOW),
+                        help=f"Only events from this window, e.g. 30m, 24h, 7d, 2w (default: {DEFAULT_WINDOW})")
+    parser.add_argument("--agent", default=None, help="Only this agent")
+    parser.add_argument("--phase", default=None, help="Only this phase")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    since = datetime.now().astimezone() - args.since
+    events = read_events(args.file or default_files, since)
+    events = [e for e in events
+              if (args.agent is None or e.get("agent") == args.agent)
+              and (args.phase is None or e.get("phase") == args.phase)]
+    rows = summarize(events)
+    if args.json:
+        print(json.dumps({"since": since.isoformat(timespec="seconds"), "events": len(events), "rows": rows},
+                         indent=2))
+    elif not rows:
+        print(f"No telemetry since {since.isoformat(timespec='seconds')}.")
+    else:
+        print(f"{len(events)} events since {since.isoformat(timespec='seconds')}\n")
+        print(format_rows(rows))
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != "stats":
+        print(__doc__.strip(), file=sys.stderr)
+        sys.exit(2)
+    stats_main(sys.argv[2:], [CODEX_TELEMETRY_FILE, VERIFY_TELEMETRY_FILE])
+
+
+if __name__ == "__main__":
+    main()